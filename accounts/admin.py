@@ -7,7 +7,7 @@ from .models import CustomUser
 class CustomUserAdmin(UserAdmin):
     """Admin configuration for CustomUser model."""
 
-    list_display = ('username', 'email', 'role', 'county', 'accountability_points', 'is_active')
+    list_display = ('username', 'email', 'role', 'county', 'accountability_points', 'complaints_count', 'is_active')
     list_filter = ('role', 'county', 'is_active', 'is_staff')
     search_fields = ('username', 'email', 'first_name', 'last_name')
     ordering = ('-date_joined',)
@@ -16,7 +16,12 @@ class CustomUserAdmin(UserAdmin):
         ('Profile Information', {
             'fields': ('role', 'county', 'phone_number', 'accountability_points', 'receive_notifications')
         }),
+        ('Complaint Stats', {
+            'fields': ('complaints_count', 'pending_complaints_count', 'verified_complaints_count'),
+            'classes': ('collapse',)
+        }),
     )
+    readonly_fields = ('complaints_count', 'pending_complaints_count', 'verified_complaints_count')
 
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('Profile Information', {
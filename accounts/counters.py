@@ -0,0 +1,106 @@
+"""Helpers for the denormalized complaint counters on CustomUser."""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import CustomUser
+
+
+def adjust_user_counters(user_id, **deltas):
+    """
+    Atomically apply counter deltas to a single user row.
+
+    Uses F() expressions so concurrent submissions never lose an update.
+    Call inside the same transaction as the complaint write.
+
+    Args:
+        user_id: Primary key of the user (no-op if None)
+        **deltas: Field name -> integer delta, e.g. complaints_count=1
+    """
+    if not user_id:
+        return 0
+
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not updates:
+        return 0
+    return CustomUser.objects.filter(pk=user_id).update(**updates)
+
+
+def complaint_counters(complaint, sign=1):
+    """
+    Counter contribution of one complaint to its owner's stats.
+
+    Pass sign=-1 to get the deltas that remove the complaint again.
+    """
+    return {
+        'complaints_count': sign,
+        'pending_complaints_count': sign * int(not complaint.ai_processed),
+        'verified_complaints_count': sign * int(complaint.is_verified),
+    }
+
+
+def adjust_counters_for_queryset(complaints, field, delta):
+    """
+    Apply a counter delta for every owned complaint in a queryset.
+
+    Groups by user so a bulk admin action costs one UPDATE per affected user
+    instead of one per complaint.
+    """
+    per_user = (
+        complaints.filter(user__isnull=False)
+        .values('user')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    for row in per_user:
+        adjust_user_counters(row['user'], **{field: delta * row['count']})
+
+
+def recount_user_stats(users=None, batch_size=1000):
+    """
+    Rebuild complaint counters from the complaints table.
+
+    Runs one correlated UPDATE per batch of user ids so the repair never
+    holds locks on the whole users table at once.
+
+    Args:
+        users: Optional CustomUser queryset to limit the repair
+        batch_size: Number of users updated per statement
+
+    Returns:
+        int: Number of user rows updated
+    """
+    users = CustomUser.objects.all() if users is None else users
+    user_ids = users.order_by('pk').values_list('pk', flat=True)
+
+    updated = 0
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=batch_size):
+        batch.append(user_id)
+        if len(batch) >= batch_size:
+            updated += _recount_batch(batch)
+            batch = []
+    if batch:
+        updated += _recount_batch(batch)
+    return updated
+
+
+def _complaint_count(condition=Q()):
+    """Correlated subquery counting a user's complaints matching condition."""
+    from complaints.models import Complaint
+
+    subquery = (
+        Complaint.objects.filter(condition, user=OuterRef('pk'))
+        .order_by()
+        .values('user')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def _recount_batch(user_ids):
+    return CustomUser.objects.filter(pk__in=user_ids).update(
+        complaints_count=_complaint_count(),
+        pending_complaints_count=_complaint_count(Q(ai_processed=False)),
+        verified_complaints_count=_complaint_count(Q(is_verified=True)),
+    )
@@ -0,0 +1,58 @@
+"""
+Management command to delete expired rows from django_session in batches.
+Usage: python manage.py purge_expired_sessions [--batch-size N] [--pause S]
+
+Unlike `clearsessions`, which issues one DELETE over every expired row,
+each batch here is its own short transaction, so the table is never
+locked for long. Safe to run on a schedule.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Delete expired database sessions in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Sessions deleted per statement (default: 5000)'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Seconds to sleep between batches (default: 0.1)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.SESSION_ENGINE.endswith(('.db', '.cached_db')):
+            self.stdout.write(f'{settings.SESSION_ENGINE} does not use the session table; nothing to do.')
+            return
+
+        now = timezone.now()
+        deleted = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:options['batch_size']]
+            )
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            batches += 1
+            time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired sessions in {batches} batches'))
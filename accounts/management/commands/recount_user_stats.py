@@ -0,0 +1,30 @@
+"""Management command to rebuild the denormalized per-user complaint counters."""
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from accounts.counters import recount_user_stats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recount complaints_count, pending and verified counters for users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            help='Only repair the counters of this user'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Users updated per statement (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['username']:
+            users = users.filter(username=options['username'])
+
+        updated = recount_user_stats(users, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recounted complaint stats for {updated} users'))
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.26 on 2026-10-19 09:00
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    Complaint = apps.get_model("complaints", "Complaint")
+
+    def count(condition=Q()):
+        subquery = (
+            Complaint.objects.filter(condition, user=OuterRef("pk"))
+            .order_by()
+            .values("user")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    CustomUser.objects.update(
+        complaints_count=count(),
+        pending_complaints_count=count(Q(ai_processed=False)),
+        verified_complaints_count=count(Q(is_verified=True)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("complaints", "0002_complaint_is_anonymous_complaint_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="complaints_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Complaints submitted under this account"
+            ),
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="pending_complaints_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Submitted complaints awaiting AI processing"
+            ),
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="verified_complaints_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Submitted complaints verified by an admin"
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -82,6 +82,20 @@ class CustomUser(AbstractUser):
         help_text="Points earned from civic participation"
     )
 
+    # Denormalized complaint counters (kept in sync by accounts.counters)
+    complaints_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Complaints submitted under this account"
+    )
+    pending_complaints_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Submitted complaints awaiting AI processing"
+    )
+    verified_complaints_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Submitted complaints verified by an admin"
+    )
+
     # Profile settings
     receive_notifications = models.BooleanField(
         default=True,
@@ -4,9 +4,14 @@ from django.contrib import messages
 from django.db.models import Count, Q
 from django.utils import timezone
 from django.core.paginator import Paginator
+from django.db import router, transaction
 from datetime import timedelta
 from complaints.models import Complaint
 from accounts.models import CustomUser
+from accounts.counters import adjust_user_counters, complaint_counters
+from complaints.cards import schedule_card_render
+from complaints.exports import streaming_csv_response
+from config.routers import replica_reads
 
 
 def is_admin(user):
@@ -16,6 +21,7 @@ def is_admin(user):
 
 @login_required
 @user_passes_test(is_admin, login_url='accounts:login')
+@replica_reads
 def admin_dashboard(request):
     """Admin dashboard with overview and management tools."""
 
@@ -84,9 +90,13 @@ def admin_dashboard(request):
 def verify_complaint(request, complaint_id):
     """Mark a complaint as verified."""
     try:
-        complaint = Complaint.objects.get(id=complaint_id)
-        complaint.is_verified = True
-        complaint.save()
+        with transaction.atomic():
+            complaint = Complaint.objects.select_for_update().get(id=complaint_id)
+            if not complaint.is_verified:
+                complaint.is_verified = True
+                complaint.save()
+                adjust_user_counters(complaint.user_id, verified_complaints_count=1)
+                schedule_card_render(complaint.pk)
         messages.success(request, f'Complaint {complaint_id} has been verified.')
     except Complaint.DoesNotExist:
         messages.error(request, 'Complaint not found.')
@@ -96,8 +106,43 @@ def verify_complaint(request, complaint_id):
 
 @login_required
 @user_passes_test(is_admin, login_url='accounts:login')
+@replica_reads
 def complaints_list(request):
     """List all complaints with filtering and pagination."""
+    complaints, filters = _filtered_complaints(request)
+
+    # Pagination
+    paginator = Paginator(complaints, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+
+    context = {
+        'page_obj': page_obj,
+        'category_filter': filters['category'],
+        'urgency_filter': filters['urgency'],
+        'verified_filter': filters['verified'],
+        'search_query': filters['search'],
+        'total_count': complaints.count(),
+        'export_query': request.GET.urlencode(),
+    }
+
+    return render(request, 'admin_panel/complaints_list.html', context)
+
+
+@login_required
+@user_passes_test(is_admin, login_url='accounts:login')
+@replica_reads
+def export_complaints(request):
+    """Stream the filtered complaints list as CSV (add ?gzip=1 to compress)."""
+    complaints, _ = _filtered_complaints(request)
+    # Rows are streamed after the view returns, outside replica_reads
+    complaints = complaints.using(router.db_for_read(Complaint))
+    compress = request.GET.get('gzip', '') in ('1', 'true', 'yes')
+    return streaming_csv_response(complaints, compress=compress)
+
+
+def _filtered_complaints(request):
+    """Apply the complaints list filters from the query string."""
     complaints = Complaint.objects.all().order_by('-created_at')
 
     # Filtering
@@ -125,21 +170,13 @@ def complaints_list(request):
             Q(officer_name__icontains=search_query)
         )
 
-    # Pagination
-    paginator = Paginator(complaints, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-
-    context = {
-        'page_obj': page_obj,
-        'category_filter': category_filter,
-        'urgency_filter': urgency_filter,
-        'verified_filter': verified_filter,
-        'search_query': search_query,
-        'total_count': complaints.count(),
+    filters = {
+        'category': category_filter,
+        'urgency': urgency_filter,
+        'verified': verified_filter,
+        'search': search_query,
     }
-
-    return render(request, 'admin_panel/complaints_list.html', context)
+    return complaints, filters
 
 
 @login_required
@@ -151,16 +188,26 @@ def complaint_detail(request, complaint_id):
     if request.method == 'POST':
         action = request.POST.get('action')
 
-        if action == 'verify':
-            complaint.is_verified = True
-            complaint.save()
-            messages.success(request, 'Complaint verified successfully.')
-        elif action == 'unverify':
-            complaint.is_verified = False
-            complaint.save()
-            messages.success(request, 'Complaint unverified.')
+        if action in ('verify', 'unverify'):
+            is_verified = action == 'verify'
+            with transaction.atomic():
+                complaint = Complaint.objects.select_for_update().get(id=complaint.id)
+                if complaint.is_verified != is_verified:
+                    complaint.is_verified = is_verified
+                    complaint.save()
+                    adjust_user_counters(
+                        complaint.user_id,
+                        verified_complaints_count=1 if is_verified else -1,
+                    )
+                    schedule_card_render(complaint.pk)
+            if is_verified:
+                messages.success(request, 'Complaint verified successfully.')
+            else:
+                messages.success(request, 'Complaint unverified.')
         elif action == 'delete':
-            complaint.delete()
+            with transaction.atomic():
+                adjust_user_counters(complaint.user_id, **complaint_counters(complaint, sign=-1))
+                complaint.delete()
             messages.success(request, 'Complaint deleted successfully.')
             return redirect('admin_panel:complaints_list')
 
@@ -173,6 +220,7 @@ def complaint_detail(request, complaint_id):
 
 @login_required
 @user_passes_test(is_admin, login_url='accounts:login')
+@replica_reads
 def users_list(request):
     """List all users with filtering."""
     users = CustomUser.objects.all().order_by('-date_joined')
@@ -1,7 +1,7 @@
 """OpenAI API service for audio transcription and complaint analysis."""
 import json
-from openai import OpenAI
 from django.conf import settings
+from config.instrumentation import ai_call
 
 
 class OpenAIService:
@@ -25,6 +25,10 @@ class OpenAIService:
         api_key = getattr(settings, 'OPENAI_API_KEY', None)
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in settings")
+        # Imported here: the SDK (httpx, pydantic) takes most of a second to
+        # load, and most processes that import this module never call it
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=api_key)
 
     def transcribe_audio(self, audio_file_path):
@@ -41,7 +45,7 @@ class OpenAIService:
             Exception: If transcription fails
         """
         try:
-            with open(audio_file_path, 'rb') as audio_file:
+            with open(audio_file_path, 'rb') as audio_file, ai_call('transcribe'):
                 transcript = self.client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
@@ -101,15 +105,16 @@ Guidelines:
 Respond ONLY with the JSON object, no additional text."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant that analyzes civic complaints from Kenyan citizens. You extract key information and provide structured analysis."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
+            with ai_call('analyze'):
+                response = self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are an AI assistant that analyzes civic complaints from Kenyan citizens. You extract key information and provide structured analysis."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.3
+                )
 
             # Extract and parse JSON response
             response_text = response.choices[0].message.content
@@ -165,15 +170,16 @@ Respond ONLY with the JSON object, no additional text."""
             str: 2-3 sentence summary
         """
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant that summarizes civic complaints concisely and professionally."},
-                    {"role": "user", "content": f"Summarize this complaint in 2-3 clear, professional sentences:\n\n{text}"}
-                ],
-                temperature=0.3,
-                max_tokens=256
-            )
+            with ai_call('summarize'):
+                response = self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are an AI assistant that summarizes civic complaints concisely and professionally."},
+                        {"role": "user", "content": f"Summarize this complaint in 2-3 clear, professional sentences:\n\n{text}"}
+                    ],
+                    temperature=0.3,
+                    max_tokens=256
+                )
             return response.choices[0].message.content.strip()
         except Exception as e:
             raise Exception(f"OpenAI summarization failed: {str(e)}")
@@ -1,7 +1,7 @@
 """Whisper API service for audio transcription."""
 import os
-from openai import OpenAI
 from django.conf import settings
+from config.instrumentation import ai_call
 
 
 class WhisperService:
@@ -12,6 +12,10 @@ class WhisperService:
         api_key = getattr(settings, 'OPENAI_API_KEY', None)
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in settings")
+        # Imported here: the SDK (httpx, pydantic) takes most of a second to
+        # load, and most processes that import this module never call it
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=api_key)
 
     def transcribe_audio(self, audio_file_path):
@@ -28,7 +32,7 @@ class WhisperService:
             Exception: If transcription fails
         """
         try:
-            with open(audio_file_path, 'rb') as audio_file:
+            with open(audio_file_path, 'rb') as audio_file, ai_call('transcribe'):
                 transcript = self.client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
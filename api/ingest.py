@@ -0,0 +1,205 @@
+"""Batch validation and insertion for partner complaint ingestion."""
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from complaints.forms import KENYA_COUNTIES
+from complaints.models import Complaint
+
+# Record fields accepted from partners, with their maximum lengths
+TEXT_FIELDS = {
+    'external_id': Complaint._meta.get_field('external_id').max_length,
+    'officer_name': Complaint._meta.get_field('officer_name').max_length,
+    'department_name': Complaint._meta.get_field('department_name').max_length,
+}
+MAX_RAW_TEXT_LENGTH = 10000
+
+VALID_CATEGORIES = {value for value, _ in Complaint.CATEGORY_CHOICES}
+VALID_URGENCIES = {value for value, _ in Complaint.URGENCY_CHOICES}
+# The web form is the only intake that may use the 'web' channel
+PARTNER_CHANNELS = {value for value, _ in Complaint.CHANNEL_CHOICES} - {'web'}
+
+# Accept both the form's county slugs and display names ("Homa Bay")
+COUNTY_LOOKUP = {}
+for slug, name in KENYA_COUNTIES:
+    if slug:
+        COUNTY_LOOKUP[slug] = slug
+        COUNTY_LOOKUP[name.lower()] = slug
+        COUNTY_LOOKUP[name.lower().replace(' ', '_')] = slug
+
+
+def parse_ndjson(lines, max_records):
+    """
+    Parse NDJSON lines into records.
+
+    Returns:
+        tuple: (records, errors) where records is a list of (line_no, dict)
+        and errors maps line_no -> error dict for lines that failed to parse.
+
+    Raises:
+        ValueError: If the batch holds more than max_records records
+    """
+    records = []
+    errors = {}
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if len(records) + len(errors) >= max_records:
+            raise ValueError(f"Batch exceeds the maximum of {max_records} records.")
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            errors[line_no] = {'__all__': [f"Invalid JSON: {e}"]}
+            continue
+        if not isinstance(record, dict):
+            errors[line_no] = {'__all__': ["Each line must be a JSON object."]}
+            continue
+        records.append((line_no, record))
+    return records, errors
+
+
+def validate_batch(records, default_channel):
+    """
+    Validate a batch column by column instead of building a form per record.
+
+    Each field is checked in one pass over the whole batch against
+    precomputed lookup sets, which keeps validation cheap at thousands
+    of records per request.
+
+    Returns:
+        tuple: (cleaned, errors) where cleaned maps line_no -> field dict
+    """
+    errors = {}
+
+    def fail(line_no, field, message):
+        errors.setdefault(line_no, {}).setdefault(field, []).append(message)
+
+    # Unknown keys
+    allowed = {'raw_text', 'county', 'category', 'urgency', 'channel', *TEXT_FIELDS}
+    for line_no, record in records:
+        unknown = record.keys() - allowed
+        if unknown:
+            fail(line_no, '__all__', f"Unknown fields: {', '.join(sorted(unknown))}.")
+
+    # raw_text: required, bounded
+    for line_no, record in records:
+        raw_text = record.get('raw_text')
+        if not isinstance(raw_text, str) or not raw_text.strip():
+            fail(line_no, 'raw_text', "This field is required.")
+        elif len(raw_text) > MAX_RAW_TEXT_LENGTH:
+            fail(line_no, 'raw_text', f"Ensure this value has at most {MAX_RAW_TEXT_LENGTH} characters.")
+
+    # county: required, normalized to the web form's slugs
+    counties = {}
+    for line_no, record in records:
+        county = COUNTY_LOOKUP.get(str(record.get('county', '')).strip().lower())
+        if county is None:
+            fail(line_no, 'county', "Unknown Kenyan county.")
+        counties[line_no] = county
+
+    # Choice fields with defaults
+    for field, valid, default in (
+        ('category', VALID_CATEGORIES, 'other'),
+        ('urgency', VALID_URGENCIES, 'medium'),
+        ('channel', PARTNER_CHANNELS, default_channel),
+    ):
+        for line_no, record in records:
+            value = record.setdefault(field, default)
+            # Lists and objects are unhashable: check the type before the set lookup
+            if not isinstance(value, str) or value not in valid:
+                fail(line_no, field, f"Select a valid choice. {value!r} is not one of the available choices.")
+
+    # Optional bounded text fields
+    for field, max_length in TEXT_FIELDS.items():
+        for line_no, record in records:
+            value = record.setdefault(field, '')
+            if not isinstance(value, str):
+                fail(line_no, field, "Must be a string.")
+            elif len(value) > max_length:
+                fail(line_no, field, f"Ensure this value has at most {max_length} characters.")
+
+    # Duplicate external ids inside the batch itself
+    seen = set()
+    for line_no, record in records:
+        if line_no in errors:
+            # channel or external_id may be a non-string
+            continue
+        key = (record['channel'], record['external_id'])
+        if record['external_id'] and key in seen:
+            fail(line_no, 'external_id', "Duplicate external_id within this batch.")
+        seen.add(key)
+
+    cleaned = {}
+    for line_no, record in records:
+        if line_no in errors:
+            continue
+        cleaned[line_no] = {
+            'raw_text': record['raw_text'].strip(),
+            'county': counties[line_no],
+            'category': record['category'],
+            'urgency': record['urgency'],
+            'channel': record['channel'],
+            'external_id': record['external_id'].strip(),
+            'officer_name': record['officer_name'].strip(),
+            'department_name': record['department_name'].strip(),
+        }
+    return cleaned, errors
+
+
+def find_existing(cleaned):
+    """Return line numbers whose (channel, external_id) is already stored."""
+    by_channel = {}
+    for line_no, data in cleaned.items():
+        if data['external_id']:
+            by_channel.setdefault(data['channel'], {})[data['external_id']] = line_no
+
+    existing = set()
+    for channel, refs in by_channel.items():
+        stored = Complaint.objects.filter(
+            channel=channel, external_id__in=list(refs)
+        ).values_list('external_id', flat=True)
+        existing.update(refs[ref] for ref in stored)
+    return existing
+
+
+def insert_batch(cleaned, chunk_size=None):
+    """
+    Insert validated records with bulk_create in chunks.
+
+    Complaints are stored unprocessed; AI analysis is deferred to the
+    process_complaints command so ingestion never waits on OpenAI.
+
+    Returns:
+        tuple: (created, duplicates) mapping line_no -> complaint id for
+        created rows, and a set of line numbers that were already stored.
+    """
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    line_numbers = sorted(cleaned)
+    created = {}
+    duplicates = set()
+
+    for start in range(0, len(line_numbers), chunk_size):
+        chunk = {line_no: cleaned[line_no] for line_no in line_numbers[start:start + chunk_size]}
+        for attempt in range(2):
+            skip = find_existing(chunk)
+            objects = {
+                line_no: Complaint(is_anonymous=True, ai_processed=False, **data)
+                for line_no, data in chunk.items()
+                if line_no not in skip
+            }
+            try:
+                with transaction.atomic():
+                    Complaint.objects.bulk_create(objects.values(), batch_size=chunk_size)
+            except IntegrityError:
+                # A concurrent batch stored some of the same references
+                # between the lookup and the insert; look them up again.
+                if attempt:
+                    raise
+                continue
+            duplicates.update(skip)
+            created.update((line_no, obj.id) for line_no, obj in objects.items())
+            break
+
+    return created, duplicates
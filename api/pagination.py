@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ComplaintCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the complaint_created_idx index.
+
+    Unlike page numbers it never issues COUNT(*) or large OFFSETs, so
+    page 10,000 costs the same as page 1.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,9 @@
+from rest_framework.permissions import BasePermission
+
+
+class CanIngestComplaints(BasePermission):
+    """Partner accounts need the complaints.add_complaint permission."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.has_perm('complaints.add_complaint'))
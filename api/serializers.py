@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from complaints.models import Complaint
+
+
+class ComplaintDetailSerializer(serializers.ModelSerializer):
+    """Full public representation for a single complaint."""
+
+    has_media = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Complaint
+        fields = [
+            'id', 'category', 'county', 'urgency', 'sentiment', 'summary',
+            'raw_text', 'officer_name', 'department_name', 'channel',
+            'has_media', 'ai_processed', 'is_verified', 'created_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,15 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from . import views
+
+app_name = 'api'
+
+router = DefaultRouter()
+router.register('complaints', views.ComplaintViewSet, basename='complaint')
+router.register('stats/counties', views.CountyStatsViewSet, basename='county-stats')
+router.register('stats/trends', views.TrendViewSet, basename='trends')
+
+urlpatterns = [
+    path('complaints/ingest/', views.ComplaintIngestView.as_view(), name='complaints_ingest'),
+    path('', include(router.urls)),
+]
@@ -0,0 +1,197 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Substr, TruncDate
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from rest_framework import status, viewsets
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.parsers import BaseParser
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
+from rest_framework.views import APIView
+
+from complaints.models import Complaint
+from config.routers import use_replica
+from .ingest import PARTNER_CHANNELS, insert_batch, parse_ndjson, validate_batch
+from .pagination import ComplaintCursorPagination
+from .permissions import CanIngestComplaints
+from .serializers import ComplaintDetailSerializer
+
+# Columns returned by the complaint list endpoint (plus summary_preview)
+COMPLAINT_LIST_FIELDS = (
+    'id', 'category', 'county', 'urgency', 'is_verified', 'created_at',
+)
+SUMMARY_PREVIEW_LENGTH = 200
+
+
+class PublicReadMixin:
+    """
+    Shared setup for the public read API.
+
+    Token auth only: session auth would add `Vary: Cookie` and defeat
+    response caching. Anonymous clients are throttled per IP, token
+    holders per account. Reads are served from the replica when there is
+    one.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [AllowAny]
+    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ComplaintViewSet(PublicReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Public complaint feed.
+
+    The list selects only the preview columns with values() and returns
+    the row dicts as-is, skipping ModelSerializer. Filters: county,
+    category, urgency, verified (yes/no).
+    """
+    queryset = Complaint.objects.all()
+    serializer_class = ComplaintDetailSerializer
+    pagination_class = ComplaintCursorPagination
+    lookup_value_regex = '[0-9a-f-]{36}'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+
+        params = self.request.query_params
+        for field in ('county', 'category', 'urgency'):
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+        if params.get('verified') in ('yes', 'no'):
+            queryset = queryset.filter(is_verified=params['verified'] == 'yes')
+
+        return (
+            queryset
+            .annotate(summary_preview=Substr('summary', 1, SUMMARY_PREVIEW_LENGTH))
+            .values(*COMPLAINT_LIST_FIELDS, 'summary_preview')
+        )
+
+    @method_decorator(cache_page(settings.API_CACHE_SECONDS))
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(page)
+
+
+class CountyStatsViewSet(PublicReadMixin, viewsets.ViewSet):
+    """Complaint totals per county, computed with one GROUP BY and cached."""
+
+    def list(self, request):
+        data = cache.get('api:county-stats')
+        if data is None:
+            data = list(
+                Complaint.objects.values('county')
+                .annotate(
+                    total=Count('pk'),
+                    verified=Count('pk', filter=Q(is_verified=True)),
+                    critical=Count('pk', filter=Q(urgency='critical')),
+                )
+                .order_by('-total')
+            )
+            cache.set('api:county-stats', data, settings.API_CACHE_SECONDS)
+        return Response(data)
+
+
+class TrendViewSet(PublicReadMixin, viewsets.ViewSet):
+    """Daily complaint counts for the last `days` days (max 90), optional county."""
+
+    def list(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 90)
+        except ValueError:
+            days = 30
+        county = request.query_params.get('county', '')
+
+        cache_key = f'api:trends:{days}:{county}'
+        data = cache.get(cache_key)
+        if data is None:
+            since = timezone.now() - timedelta(days=days)
+            complaints = Complaint.objects.filter(created_at__gte=since)
+            if county:
+                complaints = complaints.filter(county=county)
+            data = [
+                {'date': row['date'].isoformat(), 'count': row['count']}
+                for row in complaints.annotate(date=TruncDate('created_at'))
+                .values('date')
+                .annotate(count=Count('pk'))
+                .order_by('date')
+            ]
+            cache.set(cache_key, data, settings.API_CACHE_SECONDS)
+        return Response(data)
+
+
+class NDJSONParser(BaseParser):
+    """Declare NDJSON support; the ingest view reads the raw stream itself."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class ComplaintIngestView(APIView):
+    """
+    Bulk complaint ingestion for SMS/USSD gateways and field offices.
+
+    POST one complaint per line as NDJSON. Valid records are stored
+    unprocessed and picked up later by `process_complaints`; the response
+    reports the outcome of every line.
+    """
+    authentication_classes = [TokenAuthentication, SessionAuthentication]
+    permission_classes = [CanIngestComplaints]
+    parser_classes = [NDJSONParser]
+    # INGEST_THROTTLE_RATE, per account
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'ingest'
+
+    def post(self, request):
+        channel = request.query_params.get('channel', 'partner')
+        if channel not in PARTNER_CHANNELS:
+            return Response(
+                {'detail': f"Unknown channel {channel!r}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Read line by line from the request stream rather than request.body,
+        # so large batches are not capped by DATA_UPLOAD_MAX_MEMORY_SIZE.
+        stream = request.stream
+        try:
+            records, errors = parse_ndjson(
+                stream if stream is not None else [],
+                max_records=settings.INGEST_MAX_RECORDS,
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        if not records and not errors:
+            return Response({'detail': "Empty batch."}, status=status.HTTP_400_BAD_REQUEST)
+
+        cleaned, validation_errors = validate_batch(records, default_channel=channel)
+        errors.update(validation_errors)
+        created, duplicates = insert_batch(cleaned)
+
+        results = []
+        for line_no in sorted([*errors, *cleaned]):
+            if line_no in errors:
+                results.append({'line': line_no, 'status': 'invalid', 'errors': errors[line_no]})
+            elif line_no in duplicates:
+                results.append({'line': line_no, 'status': 'duplicate'})
+            else:
+                results.append({'line': line_no, 'status': 'created', 'id': str(created[line_no])})
+
+        return Response({
+            'created': len(created),
+            'duplicates': len(duplicates),
+            'invalid': len(errors),
+            'results': results,
+        })
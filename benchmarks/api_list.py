@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Benchmark for the public complaint list API (GET /api/complaints/).
+
+Tops the database up to --rows complaints with bulk_create, then drives the
+list endpoint in-process through Django's test client and reports requests
+per second and latency percentiles for:
+
+  * first page, response cache cold
+  * deep pages reached by following cursors (cache cold)
+  * first page served from the response cache
+
+Throttling is switched off for the run. Usage:
+
+    python benchmarks/api_list.py --rows 1000000 --requests 500
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from api import views  # noqa: E402
+from complaints.forms import KENYA_COUNTIES  # noqa: E402
+from complaints.models import Complaint  # noqa: E402
+
+COUNTIES = [slug for slug, _ in KENYA_COUNTIES if slug]
+CATEGORIES = [value for value, _ in Complaint.CATEGORY_CHOICES]
+URGENCIES = [value for value, _ in Complaint.URGENCY_CHOICES]
+
+
+def top_up(rows, chunk_size=10000):
+    existing = Complaint.objects.count()
+    missing = rows - existing
+    if missing <= 0:
+        print(f'Using {existing:,} existing complaints')
+        return
+    print(f'Inserting {missing:,} complaints ({existing:,} present)...')
+    rng = random.Random(42)
+    started = time.perf_counter()
+    for start in range(0, missing, chunk_size):
+        Complaint.objects.bulk_create([
+            Complaint(
+                raw_text='Benchmark complaint',
+                summary='Benchmark complaint summary ' * rng.randint(1, 8),
+                county=rng.choice(COUNTIES),
+                category=rng.choice(CATEGORIES),
+                urgency=rng.choice(URGENCIES),
+                is_verified=rng.random() < 0.4,
+                ai_processed=True,
+            )
+            for _ in range(min(chunk_size, missing - start))
+        ])
+    print(f'  done in {time.perf_counter() - started:.1f}s')
+
+
+def run(client, paths, label):
+    timings = []
+    started = time.perf_counter()
+    for path in paths:
+        t0 = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == 200, (path, response.status_code)
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+    print(
+        f'{label:<28} {len(paths) / elapsed:>9.1f} req/s   '
+        f'p50 {statistics.median(timings):>7.2f} ms   p95 {p95:>7.2f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=50)
+    options = parser.parse_args()
+
+    top_up(options.rows)
+    views.ComplaintViewSet.throttle_classes = []
+    client = Client(HTTP_HOST='localhost')
+    first_page = f'/api/complaints/?page_size={options.page_size}'
+
+    # Collect cursors for deep pages by walking the feed once
+    cursors = []
+    path = first_page
+    while path and len(cursors) < options.requests:
+        data = client.get(path).json()
+        path = data['next']
+        if path:
+            cursors.append(path.split('://', 1)[-1].split('/', 1)[-1])
+    cursors = ['/' + c for c in cursors]
+
+    print(f'\nGET /api/complaints/ at {Complaint.objects.count():,} rows, page_size={options.page_size}')
+    cold = []
+    for i in range(options.requests):
+        cold.append(f'{first_page}&nocache={i}')
+    cache.clear()
+    run(client, cold, 'first page (uncached)')
+    cache.clear()
+    run(client, cursors, f'cursor pages 2..{len(cursors) + 1}')
+    cache.clear()
+    run(client, [first_page] * options.requests, 'first page (cached)')
+
+
+if __name__ == '__main__':
+    main()
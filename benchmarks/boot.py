@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Container start-up benchmark: the old migrate/create_admin/seed_data chain vs boot.
+
+Times both against the current DATABASE_URL, which should already be set
+up (run `python manage.py boot` once), so this measures the common case
+of a restart or scale-out of an up-to-date deployment:
+
+    python benchmarks/boot.py --runs 5
+
+  * old:  manage.py migrate && create_admin && seed_data (three processes)
+  * boot: manage.py boot
+
+SEED_DATA is unset for the old chain, whose seed_data would otherwise add
+its sample complaints again on every run.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+CHAINS = {
+    'old': [['migrate'], ['create_admin'], ['seed_data']],
+    'boot': [['boot']],
+}
+
+
+def run_chain(commands):
+    env = dict(os.environ)
+    env.pop('SEED_DATA', None)
+    started = time.perf_counter()
+    for command in commands:
+        subprocess.run(
+            [sys.executable, 'manage.py', *command],
+            cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs of each chain')
+    options = parser.parse_args()
+
+    medians = {}
+    for name, commands in CHAINS.items():
+        run_chain(commands)  # warm the page cache
+        times = [run_chain(commands) for _ in range(options.runs)]
+        medians[name] = statistics.median(times)
+        print(f'{name:<5} median {medians[name] * 1000:7.0f} ms  '
+              f'min {min(times) * 1000:7.0f} ms  max {max(times) * 1000:7.0f} ms')
+
+    print(f"saved {(medians['old'] - medians['boot']) * 1000:7.0f} ms per start")
+
+
+if __name__ == '__main__':
+    main()
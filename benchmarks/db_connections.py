@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Benchmark of per-request connection setup: fresh connections vs persistent ones.
+
+Sends requests through the WSGI application in-process, so Django's
+request_started/request_finished handling closes or keeps connections
+exactly as under gunicorn, and compares:
+
+  * fresh:      CONN_MAX_AGE=0, a new connection for every request
+  * persistent: CONN_MAX_AGE=DB_CONN_MAX_AGE with health checks (the settings)
+
+for an uncached page of GET /api/complaints/. Reports latency percentiles
+and how many connections each mode opened. Point DATABASE_URL (or the
+DB_* variables) at the real Postgres server; over a network, and with
+TLS, the connect cost is much larger than against a local socket:
+
+    python benchmarks/db_connections.py --requests 500
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+from api import views  # noqa: E402
+
+application = get_wsgi_application()
+
+
+def get(path):
+    environ = {'PATH_INFO': path.split('?')[0], 'QUERY_STRING': path.partition('?')[2],
+               'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    environ['wsgi.url_scheme'] = 'https'
+    status = []
+    body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+    b''.join(body)
+    # Sends request_finished, where Django closes or keeps the connection
+    body.close()
+    assert status[0].startswith('200'), (path, status[0])
+
+
+def run(label, conn_max_age, requests, path):
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False, dispatch_uid='bench')
+    try:
+        timings = []
+        for i in range(requests):
+            # A distinct query string each time bypasses the response cache
+            t0 = time.perf_counter()
+            get(f'{path}?bench={label}-{i}')
+            timings.append((time.perf_counter() - t0) * 1000)
+    finally:
+        connection_created.disconnect(dispatch_uid='bench')
+
+    timings.sort()
+    print(
+        f'{label:<11} p50 {statistics.median(timings):>7.2f} ms   '
+        f'p95 {timings[int(len(timings) * 0.95) - 1]:>7.2f} ms   '
+        f'p99 {timings[int(len(timings) * 0.99) - 1]:>7.2f} ms   '
+        f'mean {statistics.mean(timings):>7.2f} ms   connections {len(opened)}'
+    )
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--path', default='/api/complaints/')
+    options = parser.parse_args()
+
+    views.ComplaintViewSet.throttle_classes = []
+    print(f"{connection.vendor} {connection.settings_dict['HOST'] or connection.settings_dict['NAME']}, "
+          f'{options.requests} x GET {options.path}')
+    get(options.path)  # import views, compile templates
+
+    fresh = run('fresh', 0, options.requests, options.path)
+    persistent = run('persistent', settings.DB_CONN_MAX_AGE or 600, options.requests, options.path)
+    print(f'connection setup per request: {fresh - persistent:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+Throughput and memory benchmark: the old gunicorn command vs gunicorn.conf.py.
+
+Starts each server on a local port, drives a mix of pages over keep-alive
+HTTP connections at several concurrency levels, and reports requests per
+second, latency percentiles, errors and the server's total memory (PSS,
+which counts pages shared copy-on-write between workers only once):
+
+    python benchmarks/gunicorn_config.py --concurrency 1,8,32,64 --duration 15
+
+  * baseline: gunicorn --workers 2 --timeout 120 (sync workers, no preload)
+  * tuned:    gunicorn -c gunicorn.conf.py
+
+Run it against a seeded database (seed_data, or benchmarks/api_list.py
+--rows) with the same DATABASE_URL the servers will use, and with
+DEBUG=true: with DEBUG off every page is an HTTPS redirect. The load is
+generated from Python threads on the same machine, so treat the numbers
+as a comparison between the two configurations, not as absolute capacity.
+At benchmark request rates each tuned worker reaches max_requests every
+few seconds; set GUNICORN_MAX_REQUESTS=0 to measure without recycling.
+"""
+import argparse
+import http.client
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+CONFIGS = {
+    'baseline': ['--workers', '2', '--timeout', '120'],
+    'tuned': ['-c', str(BASE_DIR / 'gunicorn.conf.py')],
+}
+DEFAULT_PATHS = '/livez,/,/about/,/api/complaints/'
+
+
+def start_server(name, port, empty_config):
+    args = CONFIGS[name]
+    if '-c' not in args:
+        # Stop gunicorn picking up ./gunicorn.conf.py for the baseline
+        args = ['-c', empty_config] + args
+    env = dict(
+        os.environ,
+        PROMETHEUS_MULTIPROC_DIR=tempfile.mkdtemp(prefix='bench-prom-'),
+        # Every request comes from one IP; the API throttles would answer 429
+        API_ANON_THROTTLE_RATE='1000000/min',
+        API_USER_THROTTLE_RATE='1000000/min',
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *args, '--bind', f'127.0.0.1:{port}', 'config.wsgi:application'],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/livez', headers={'Host': 'localhost'})
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{name} server did not start on port {port}')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def process_tree(pid):
+    """pid and all its children."""
+    pids = [pid]
+    try:
+        children = Path(f'/proc/{pid}/task/{pid}/children').read_text().split()
+    except OSError:
+        return pids
+    for child in children:
+        pids.extend(process_tree(int(child)))
+    return pids
+
+
+def memory_mb(pid):
+    """Total (PSS, RSS) in MB of a process and its children."""
+    pss = rss = 0
+    for member in process_tree(pid):
+        try:
+            for line in Path(f'/proc/{member}/smaps_rollup').read_text().splitlines():
+                if line.startswith('Pss:'):
+                    pss += int(line.split()[1])
+                elif line.startswith('Rss:'):
+                    rss += int(line.split()[1])
+        except OSError:
+            continue
+    return pss / 1024, rss / 1024
+
+
+def drive(port, paths, concurrency, duration):
+    """Hammer the server for duration seconds; returns (latencies in ms, errors)."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def request(connection, path):
+        connection.request('GET', path, headers={'Host': 'localhost'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    def client(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local, failed, i = [], 0, offset
+        while time.perf_counter() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                try:
+                    status = request(connection, path)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # The server closed the idle connection (no keep-alive): reconnect once
+                    connection.close()
+                    status = request(connection, path)
+                if status >= 300:
+                    failed += 1
+                else:
+                    local.append((time.perf_counter() - started) * 1000)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--concurrency', default='1,8,32,64', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds per concurrency level')
+    parser.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds before each level')
+    parser.add_argument('--paths', default=DEFAULT_PATHS, help='Comma-separated paths to request in turn')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--configs', default='baseline,tuned')
+    options = parser.parse_args()
+
+    levels = [int(level) for level in options.concurrency.split(',')]
+    paths = options.paths.split(',')
+
+    rows = []
+    with tempfile.NamedTemporaryFile('w', suffix='.py') as empty_config:
+        for name in options.configs.split(','):
+            process = start_server(name, options.port, empty_config.name)
+            try:
+                for concurrency in levels:
+                    drive(options.port, paths, concurrency, options.warmup)
+                    latencies, errors = drive(options.port, paths, concurrency, options.duration)
+                    pss, rss = memory_mb(process.pid)
+                    rows.append({
+                        'config': name,
+                        'concurrency': concurrency,
+                        'rps': len(latencies) / options.duration,
+                        'p50': statistics.median(latencies) if latencies else 0.0,
+                        'p95': percentile(latencies, 0.95),
+                        'p99': percentile(latencies, 0.99),
+                        'errors': errors,
+                        'pss': pss,
+                        'rss': rss,
+                    })
+                    print(f'{name} c={concurrency}: {rows[-1]["rps"]:.1f} req/s', file=sys.stderr)
+            finally:
+                stop_server(process)
+
+    print(f"\n{'config':<9} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'errors':>6} {'PSS MB':>8} {'RSS MB':>8}")
+    for r in rows:
+        print(f"{r['config']:<9} {r['concurrency']:>7} {r['rps']:>9.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+              f"{r['p99']:>8.1f} {r['errors']:>6} {r['pss']:>8.1f} {r['rss']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+"""
+View-level benchmark suite with query-count and latency budgets.
+
+Resolves every named GET route in config/urls.py, seeds the database up to
+each requested size with `seed_data --count`, and records for each view:
+p50/p95 latency, SQL query count, SQL time and response size. Results are
+compared against benchmarks/budgets.json and the run exits non-zero on any
+regression, so N+1 queries and heavier aggregates are caught before deploy.
+
+    SEED_DATA=true python benchmarks/view_budgets.py --sizes 10000,100000,1000000
+    python benchmarks/view_budgets.py --sizes 10000 --update-budgets
+
+Query counts must match the budget exactly or be lower. Latency and size
+may exceed the budget by --latency-tolerance / --size-tolerance, since they
+depend on the machine. Views are measured uncached (the cache is cleared
+before every request) and views behind login are requested as the admin.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core import signing  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.shortcuts import resolve_url  # noqa: E402
+from django.urls import URLPattern, URLResolver, get_resolver, reverse  # noqa: E402
+
+from complaints.models import Complaint  # noqa: E402
+from complaints.views import SUCCESS_LINK_SALT  # noqa: E402
+
+BUDGETS_FILE = Path(__file__).resolve().parent / 'budgets.json'
+
+# Routes that write, log out, only accept POST, or export the whole table
+SKIP_ROUTES = {
+    'accounts:logout',
+    'admin_panel:export_complaints',
+    'admin_panel:verify',
+    'api:complaints_ingest',
+    # Streams a stored file; seeded complaints have no audio
+    'complaints:audio',
+    # Resumable upload API: POST/PATCH only, keyed by a signed upload token
+    'complaints:upload_create',
+    'complaints:upload',
+    # Probes and scrapes: results are cached or depend on process state
+    'livez',
+    'readyz',
+    'metrics',
+}
+# Django's own admin is not ours to budget
+SKIP_NAMESPACES = {'admin'}
+
+
+def iter_routes(patterns=None, namespace=''):
+    """Yield (route name, kwarg names) for every named URL pattern."""
+    patterns = get_resolver().url_patterns if patterns is None else patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or ''
+            if child_namespace in SKIP_NAMESPACES:
+                continue
+            prefix = f'{namespace}{child_namespace}:' if child_namespace else namespace
+            yield from iter_routes(pattern.url_patterns, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            kwargs = set(pattern.pattern.regex.groupindex)
+            if 'format' in kwargs:
+                continue
+            yield f'{namespace}{pattern.name}', sorted(kwargs)
+
+
+def route_url(name, kwarg_names, complaint_id):
+    """Reverse a route, filling every URL parameter with a real complaint id."""
+    kwargs = {kwarg: complaint_id for kwarg in kwarg_names}
+    if 'token' in kwargs:
+        # Signed success-page links carry the id instead of the session
+        kwargs['token'] = signing.dumps(str(complaint_id), salt=SUCCESS_LINK_SALT)
+    return reverse(name, kwargs=kwargs)
+
+
+def seed_to(size):
+    existing = Complaint.objects.count()
+    if existing < size:
+        os.environ['SEED_DATA'] = 'true'
+        call_command(
+            'seed_data', count=size - existing, users=max(size // 200, 10),
+            seed=size, stdout=io.StringIO(),
+        )
+
+
+def ensure_admin():
+    User = get_user_model()
+    admin, created = User.objects.get_or_create(
+        username='bench_admin',
+        defaults={'role': 'admin', 'is_staff': True, 'is_superuser': True},
+    )
+    if created:
+        admin.set_password('bench')
+        admin.save()
+    return admin
+
+
+def measure(client, url, iterations):
+    """Request url iterations+1 times (first is warm-up) with the cache cleared."""
+    timings = []
+    queries = sql_ms = size = status = None
+    for i in range(iterations + 1):
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            t0 = time.perf_counter()
+            response = client.get(url)
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - t0) * 1000
+        if i == 0:
+            continue
+        timings.append(elapsed)
+        queries = len(captured)
+        sql_ms = sum(float(q['time']) for q in captured.captured_queries) * 1000
+        size = len(content)
+        status = response.status_code
+    timings.sort()
+    return {
+        'status': status,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[max(int(len(timings) * 0.95) - 1, 0)], 2),
+        'queries': queries,
+        'sql_ms': round(sql_ms, 2),
+        'bytes': size,
+    }
+
+
+def run_size(size, iterations):
+    seed_to(size)
+    complaint_id = str(Complaint.objects.values_list('id', flat=True).first())
+    anonymous = Client(HTTP_HOST='localhost')
+    admin = Client(HTTP_HOST='localhost')
+    admin.force_login(ensure_admin())
+    login_url = resolve_url(settings.LOGIN_URL)
+
+    results = {}
+    for name, kwarg_names in iter_routes():
+        if name in SKIP_ROUTES:
+            continue
+        url = route_url(name, kwarg_names, complaint_id)
+        client = anonymous
+        probe = anonymous.get(url)
+        if probe.status_code in (301, 302) and probe.url.startswith(login_url):
+            client = admin
+        result = measure(client, url, iterations)
+        result['as'] = 'admin' if client is admin else 'anonymous'
+        results[name] = result
+    return results
+
+
+def compare(size, results, budgets, latency_tolerance, size_tolerance):
+    """Return a list of human-readable budget violations."""
+    failures = []
+    size_budgets = budgets.get(str(size), {})
+    for name, result in results.items():
+        budget = size_budgets.get(name)
+        if budget is None:
+            failures.append(f'{size}: {name} has no budget (run with --update-budgets)')
+            continue
+        if result['queries'] > budget['queries']:
+            failures.append(f"{size}: {name} ran {result['queries']} queries (budget {budget['queries']})")
+        if result['p95_ms'] > budget['p95_ms'] * latency_tolerance:
+            failures.append(f"{size}: {name} p95 {result['p95_ms']} ms (budget {budget['p95_ms']} ms)")
+        if result['bytes'] > budget['bytes'] * size_tolerance:
+            failures.append(f"{size}: {name} returned {result['bytes']} bytes (budget {budget['bytes']})")
+        if result['status'] != budget.get('status', result['status']):
+            failures.append(f"{size}: {name} returned HTTP {result['status']} (expected {budget['status']})")
+    return failures
+
+
+def print_table(size, results):
+    print(f'\n=== {size:,} complaints ===')
+    print(f"{'route':<34} {'as':<9} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'sql ms':>9} {'bytes':>9}")
+    for name, r in sorted(results.items()):
+        print(
+            f"{name:<34} {r['as']:<9} {r['status']:>6} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['queries']:>8} {r['sql_ms']:>9.2f} {r['bytes']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='Comma-separated complaint counts, ascending')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--latency-tolerance', type=float, default=1.5)
+    parser.add_argument('--size-tolerance', type=float, default=1.1)
+    parser.add_argument('--update-budgets', action='store_true',
+                        help='Write the measured results as the new budgets')
+    parser.add_argument('--json', help='Also write raw results to this file')
+    options = parser.parse_args()
+
+    budgets = json.loads(BUDGETS_FILE.read_text()) if BUDGETS_FILE.exists() else {}
+    sizes = sorted(int(size) for size in options.sizes.split(','))
+
+    all_results = {}
+    failures = []
+    for size in sizes:
+        results = run_size(size, options.iterations)
+        all_results[str(size)] = results
+        print_table(size, results)
+        if not options.update_budgets:
+            failures += compare(size, results, budgets, options.latency_tolerance, options.size_tolerance)
+
+    if options.json:
+        Path(options.json).write_text(json.dumps(all_results, indent=2))
+
+    if options.update_budgets:
+        for size, results in all_results.items():
+            budgets[size] = {
+                name: {key: r[key] for key in ('status', 'queries', 'p95_ms', 'bytes')}
+                for name, r in sorted(results.items())
+            }
+        BUDGETS_FILE.write_text(json.dumps(budgets, indent=2, sort_keys=True) + '\n')
+        print(f'\nBudgets written to {BUDGETS_FILE}')
+        return 0
+
+    if failures:
+        print('\nBudget regressions:')
+        for failure in failures:
+            print(f'  - {failure}')
+        return 1
+    print('\nAll views within budget.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -140,7 +140,7 @@ def check_security_settings():
     results = []
 
     # Check WhiteNoise
-    if 'whitenoise.middleware.WhiteNoiseMiddleware' in settings.MIDDLEWARE:
+    if any(middleware.endswith('WhiteNoiseMiddleware') for middleware in settings.MIDDLEWARE):
         print_success("WhiteNoise middleware enabled")
         results.append(True)
     else:
@@ -12,7 +12,7 @@ def my_complaints(request):
     
     context = {
         'complaints': complaints,
-        'total_count': complaints.count(),
+        'total_count': user.complaints_count,
     }
     return render(request, 'citizen/my_complaints.html', context)
 
@@ -27,11 +27,11 @@ def citizen_dashboard(request):
     # Only show complaints where user is explicitly set
     my_complaints = Complaint.objects.filter(user=user).order_by('-created_at')[:10]
 
-    # Stats for the user's complaints only
+    # Stats come from the denormalized counters on the user row
     user_complaints = Complaint.objects.filter(user=user)
-    total_complaints = user_complaints.count()
-    pending_complaints = user_complaints.filter(ai_processed=False).count()
-    verified_complaints = user_complaints.filter(is_verified=True).count()
+    total_complaints = user.complaints_count
+    pending_complaints = user.pending_complaints_count
+    verified_complaints = user.verified_complaints_count
 
     # Category breakdown for user's complaints
     category_stats = list(
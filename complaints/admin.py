@@ -1,10 +1,22 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import format_html
+from accounts.counters import (
+    adjust_counters_for_queryset,
+    adjust_user_counters,
+    complaint_counters,
+)
+from .cards import schedule_card_render
+from .exports import streaming_csv_response
+from .images import schedule_image_processing
 from .models import Complaint
 
 
 @admin.register(Complaint)
 class ComplaintAdmin(admin.ModelAdmin):
     list_display = [
+        'image_thumbnail',
         'id',
         'category',
         'county',
@@ -14,6 +26,7 @@ class ComplaintAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = [
+        'channel',
         'category',
         'urgency',
         'county',
@@ -30,6 +43,9 @@ class ComplaintAdmin(admin.ModelAdmin):
     ]
     readonly_fields = [
         'id',
+        'image_preview',
+        'image_width',
+        'image_height',
         'created_at',
         'updated_at',
     ]
@@ -41,10 +57,10 @@ class ComplaintAdmin(admin.ModelAdmin):
             'fields': ('category', 'county', 'urgency', 'sentiment')
         }),
         ('Media', {
-            'fields': ('audio_file', 'image_file')
+            'fields': ('audio_file', 'image_file', 'image_preview', 'image_width', 'image_height')
         }),
         ('Identification', {
-            'fields': ('officer_name', 'department_name'),
+            'fields': ('officer_name', 'department_name', 'channel', 'external_id'),
             'classes': ('collapse',)
         }),
         ('Status', {
@@ -56,38 +72,72 @@ class ComplaintAdmin(admin.ModelAdmin):
         }),
     )
     date_hierarchy = 'created_at'
-    actions = ['mark_as_verified', 'export_as_csv']
+    actions = ['mark_as_verified', 'export_as_csv', 'export_as_csv_gz']
 
-    def mark_as_verified(self, request, queryset):
-        queryset.update(is_verified=True)
-        self.message_user(request, f"{queryset.count()} complaints marked as verified.")
-    mark_as_verified.short_description = "Mark selected complaints as verified"
+    @admin.display(description='Image')
+    def image_thumbnail(self, obj):
+        if not obj.image_file:
+            return ''
+        return format_html(
+            '<img src="{}" srcset="{}" sizes="48px" width="48" alt="" loading="lazy">',
+            obj.image_thumbnail_url, obj.image_srcset,
+        )
 
-    def export_as_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
+    @admin.display(description='Preview')
+    def image_preview(self, obj):
+        if not obj.image_file:
+            return '-'
+        return format_html(
+            '<img src="{}" srcset="{}" sizes="480px" style="max-width:480px" alt="">',
+            obj.image_display_url, obj.image_srcset,
+        )
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change:
+                was_processed = form.initial.get('ai_processed', obj.ai_processed)
+                was_verified = form.initial.get('is_verified', obj.is_verified)
+                adjust_user_counters(
+                    obj.user_id,
+                    pending_complaints_count=int(was_processed) - int(obj.ai_processed),
+                    verified_complaints_count=int(obj.is_verified) - int(was_verified),
+                )
+            schedule_card_render(obj.pk)
+            if 'image_file' in form.changed_data:
+                Complaint.objects.filter(pk=obj.pk).update(image_processed=False)
+                obj.image_processed = False
+                schedule_image_processing(obj)
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="complaints.csv"'
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            adjust_user_counters(obj.user_id, **complaint_counters(obj, sign=-1))
+            super().delete_model(request, obj)
 
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Category', 'County', 'Urgency', 'Summary',
-            'Officer', 'Department', 'Created At', 'Verified'
-        ])
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            adjust_counters_for_queryset(queryset, 'complaints_count', -1)
+            adjust_counters_for_queryset(queryset.filter(ai_processed=False), 'pending_complaints_count', -1)
+            adjust_counters_for_queryset(queryset.filter(is_verified=True), 'verified_complaints_count', -1)
+            super().delete_queryset(request, queryset)
 
-        for complaint in queryset:
-            writer.writerow([
-                str(complaint.id),
-                complaint.category,
-                complaint.county,
-                complaint.urgency,
-                complaint.summary or complaint.raw_text[:200],
-                complaint.officer_name,
-                complaint.department_name,
-                complaint.created_at.strftime('%Y-%m-%d %H:%M'),
-                'Yes' if complaint.is_verified else 'No'
-            ])
+    def mark_as_verified(self, request, queryset):
+        with transaction.atomic():
+            unverified_ids = list(
+                queryset.select_for_update().filter(is_verified=False).values_list('pk', flat=True)
+            )
+            unverified = Complaint.objects.filter(pk__in=unverified_ids)
+            adjust_counters_for_queryset(unverified, 'verified_complaints_count', 1)
+            unverified.update(is_verified=True, updated_at=timezone.now())
+            for pk in unverified_ids:
+                schedule_card_render(pk)
+        self.message_user(request, f"{queryset.count()} complaints marked as verified.")
+    mark_as_verified.short_description = "Mark selected complaints as verified"
 
-        return response
+    def export_as_csv(self, request, queryset):
+        return streaming_csv_response(queryset)
     export_as_csv.short_description = "Export selected complaints as CSV"
+
+    def export_as_csv_gz(self, request, queryset):
+        return streaming_csv_response(queryset, compress=True)
+    export_as_csv_gz.short_description = "Export selected complaints as gzipped CSV"
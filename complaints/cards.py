@@ -0,0 +1,191 @@
+"""
+Open Graph images for shareable complaint cards.
+
+Cards are rendered with Pillow to PNG and WebP and written under
+OPEN_DATA_ROOT/cards with the content hash in the file name, so
+OpenDataWhiteNoiseMiddleware serves them as immutable. A complaint is
+only re-rendered when the fields drawn on the card change; the
+fingerprint of those fields is stored on the complaint.
+
+Rendering never happens inside a request: views queue it with
+schedule_card_render() (run after commit by config.background), and
+process_complaints / render_card_images sweep anything left stale.
+"""
+import hashlib
+import io
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import F, Q
+from PIL import Image, ImageDraw, ImageFont
+
+from config.background import run_after_commit
+
+from .models import Complaint
+
+# Bump when the layout changes so every card is redrawn
+RENDERER_VERSION = 1
+
+CARD_SIZE = (1200, 630)
+CARD_DIR = 'cards'
+
+URGENCY_COLOURS = {
+    'critical': ('#ef4444', '#ffffff'),
+    'high': ('#fb923c', '#ffffff'),
+    'medium': ('#facc15', '#1f2937'),
+    'low': ('#d1d5db', '#374151'),
+}
+
+
+def card_fields(complaint):
+    """The values drawn on the card; a change here means a new image."""
+    return {
+        'version': RENDERER_VERSION,
+        'category': complaint.get_category_display(),
+        'urgency': complaint.urgency,
+        'urgency_label': complaint.get_urgency_display(),
+        'county': complaint.county,
+        'date': complaint.created_at.strftime('%b %d, %Y'),
+        'summary': complaint.summary or complaint.short_summary,
+        'verified': complaint.is_verified,
+    }
+
+
+def card_fingerprint(fields):
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def load_font(size, bold=False):
+    font_path = settings.CARD_FONT_BOLD_PATH if bold else settings.CARD_FONT_PATH
+    try:
+        return ImageFont.truetype(font_path, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def wrap_text(draw, text, font, max_width, max_lines):
+    """Greedy word wrap measured in pixels, ellipsised after max_lines."""
+    lines = []
+    for word in text.split():
+        if lines and draw.textlength(f'{lines[-1]} {word}', font=font) <= max_width:
+            lines[-1] = f'{lines[-1]} {word}'
+        else:
+            lines.append(word)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        last = lines[-1]
+        while ' ' in last and draw.textlength(last + '…', font=font) > max_width:
+            last = last.rsplit(' ', 1)[0]
+        lines[-1] = last + '…'
+    return lines
+
+
+def draw_card(fields):
+    """Return the card as a Pillow image."""
+    width, height = CARD_SIZE
+    image = Image.new('RGB', CARD_SIZE, '#ffffff')
+    draw = ImageDraw.Draw(image)
+
+    # Kenyan flag stripe along the top, green footer band
+    for i, colour in enumerate(('#000000', '#bb0000', '#006600')):
+        draw.rectangle([0, i * 8, width, i * 8 + 8], fill=colour)
+    draw.rectangle([0, height - 90, width, height], fill='#15803d')
+
+    badge_bg, badge_fg = URGENCY_COLOURS.get(fields['urgency'], URGENCY_COLOURS['low'])
+    badge_font = load_font(28, bold=True)
+    badge_text = fields['urgency_label'].upper()
+    badge_width = draw.textlength(badge_text, font=badge_font) + 40
+    draw.rounded_rectangle([60, 60, 60 + badge_width, 110], radius=25, fill=badge_bg)
+    draw.text((80, 70), badge_text, font=badge_font, fill=badge_fg)
+
+    category_font = load_font(28)
+    draw.text((80 + badge_width, 70), fields['category'], font=category_font, fill='#374151')
+    if fields['verified']:
+        draw.text((width - 220, 70), '✓ Verified', font=badge_font, fill='#15803d')
+
+    summary_font = load_font(44, bold=True)
+    y = 150
+    for line in wrap_text(draw, fields['summary'], summary_font, width - 160, 5):
+        draw.text((60, y), line, font=summary_font, fill='#111827')
+        y += 58
+
+    meta_font = load_font(30)
+    draw.text((60, height - 140), f"{fields['county']}  ·  {fields['date']}", font=meta_font, fill='#6b7280')
+    draw.text((60, height - 65), 'Sauti ya Wananchi', font=load_font(34, bold=True), fill='#ffffff')
+    return image
+
+
+def encode(image, image_format):
+    buffer = io.BytesIO()
+    if image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=85, method=6)
+    else:
+        image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def write_hashed(data, extension):
+    """Store data under a name derived from its hash; identical cards share a file."""
+    digest = hashlib.sha256(data).hexdigest()
+    relative_path = f'{CARD_DIR}/{digest[:2]}/card.{digest[:12]}.{extension}'
+    path = os.path.join(settings.OPEN_DATA_ROOT, relative_path)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as output:
+            output.write(data)
+        os.replace(tmp_path, path)
+    return relative_path
+
+
+def render_card(complaint, force=False):
+    """Render and store the complaint's card if its visible fields changed."""
+    fields = card_fields(complaint)
+    fingerprint = card_fingerprint(fields)
+    updates = {'card_version': complaint.updated_at}
+
+    rendered = force or fingerprint != complaint.card_fingerprint
+    if rendered:
+        image = draw_card(fields)
+        updates.update(
+            card_fingerprint=fingerprint,
+            card_image_png=write_hashed(encode(image, 'PNG'), 'png'),
+            card_image_webp=write_hashed(encode(image, 'WEBP'), 'webp'),
+        )
+
+    # update() leaves updated_at alone, so this does not itself make the card stale
+    Complaint.objects.filter(pk=complaint.pk).update(**updates)
+    return rendered
+
+
+def stale_cards():
+    """Processed complaints whose card predates their last update."""
+    return Complaint.objects.filter(ai_processed=True).filter(
+        Q(card_version__isnull=True) | ~Q(card_version=F('updated_at'))
+    )
+
+
+def render_stale_cards(limit=None):
+    """Render every stale card; returns (checked, rendered)."""
+    complaints = stale_cards().order_by('created_at')
+    if limit:
+        complaints = complaints[:limit]
+    checked = rendered = 0
+    for complaint in complaints.iterator(chunk_size=500):
+        checked += 1
+        rendered += render_card(complaint)
+    return checked, rendered
+
+
+def render_card_by_id(complaint_id):
+    complaint = Complaint.objects.filter(pk=complaint_id, ai_processed=True).first()
+    if complaint is not None:
+        render_card(complaint)
+
+
+def schedule_card_render(complaint_id):
+    """Queue a card render to run after the current transaction commits."""
+    run_after_commit(render_card_by_id, complaint_id)
@@ -1,5 +1,10 @@
+import os
+
 from django import forms
+from django.conf import settings
+from .media_probe import ProbeError, probe_audio, probe_image
 from .models import Complaint
+from .uploads import UploadError, open_completed
 
 
 # Kenyan counties
@@ -74,6 +79,10 @@ class ComplaintForm(forms.ModelForm):
         help_text="Your identity will not be shown publicly"
     )
 
+    # Token of a completed resumable upload (complaints.uploads), sent by the
+    # submit page's script in place of the audio file itself
+    audio_upload = forms.CharField(required=False, widget=forms.HiddenInput)
+
     class Meta:
         model = Complaint
         fields = [
@@ -87,6 +96,11 @@ class ComplaintForm(forms.ModelForm):
             'department_name',
             'is_anonymous',
         ]
+        # Plain FileField: clean_image_file probes the header instead of
+        # letting ImageField decode the whole image
+        field_classes = {
+            'image_file': forms.FileField,
+        }
         widgets = {
             'raw_text': forms.Textarea(attrs={
                 'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-green-500 focus:border-transparent',
@@ -122,18 +136,60 @@ class ComplaintForm(forms.ModelForm):
     def clean_audio_file(self):
         audio = self.cleaned_data.get('audio_file')
         if audio:
-            # Check file size (max 10MB)
-            if audio.size > 10 * 1024 * 1024:
-                raise forms.ValidationError("Audio file must be less than 10MB.")
-            # Check content type
-            if audio.content_type not in ['audio/mpeg', 'audio/wav', 'audio/ogg', 'audio/webm']:
-                raise forms.ValidationError("Invalid audio format. Use MP3, WAV, OGG, or WebM.")
+            self._check_audio(audio)
         return audio
 
+    def clean(self):
+        cleaned_data = super().clean()
+        token = cleaned_data.get('audio_upload')
+        if token and not cleaned_data.get('audio_file'):
+            try:
+                audio = open_completed(token)
+            except UploadError as e:
+                self.add_error('audio_file', str(e))
+                return cleaned_data
+            try:
+                self._check_audio(audio)
+            except forms.ValidationError as e:
+                audio.close()
+                self.add_error('audio_file', e)
+            else:
+                cleaned_data['audio_file'] = audio
+        return cleaned_data
+
+    def _check_audio(self, audio):
+        # Check file size (max 10MB)
+        if audio.size > 10 * 1024 * 1024:
+            raise forms.ValidationError("Audio file must be less than 10MB.")
+        # Read the real format and duration from the container header;
+        # the client's content type is not trusted
+        try:
+            info = probe_audio(audio)
+        except ProbeError:
+            raise forms.ValidationError("Invalid audio format. Use MP3, WAV, OGG, or WebM.")
+        if info.content_type not in settings.ALLOWED_AUDIO_TYPES:
+            raise forms.ValidationError("Invalid audio format. Use MP3, WAV, OGG, or WebM.")
+        if info.duration is not None and info.duration > settings.MAX_AUDIO_DURATION_SECONDS + 1:
+            raise forms.ValidationError(
+                f"Audio must be at most {settings.MAX_AUDIO_DURATION_SECONDS} seconds "
+                f"(this recording is {info.duration:.0f} seconds)."
+            )
+        # Whisper picks the decoder from the extension, so make it match
+        audio.content_type = info.content_type
+        audio.name = f'{os.path.splitext(audio.name)[0]}.{info.format}'
+
     def clean_image_file(self):
         image = self.cleaned_data.get('image_file')
         if image:
             # Check file size (max 5MB)
             if image.size > 5 * 1024 * 1024:
                 raise forms.ValidationError("Image file must be less than 5MB.")
+            try:
+                info = probe_image(image)
+            except ProbeError:
+                raise forms.ValidationError("Upload a valid JPEG, PNG or WebP image.")
+            # A small file can still declare enormous dimensions (decompression bomb)
+            if info.width * info.height > settings.MAX_IMAGE_PIXELS:
+                raise forms.ValidationError("Image dimensions are too large.")
+            image.content_type = info.content_type
         return image
@@ -0,0 +1,59 @@
+"""
+Rendered-HTML cache for per-complaint template fragments.
+
+Keys are (complaint id, updated_at, variant), so any save that bumps
+updated_at moves readers to a fresh key; Complaint.save() and delete()
+also drop the old keys explicitly. A cold miss is rendered by a single
+caller: the others wait for its result instead of rendering in parallel.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Template variants that cache a complaint fragment
+FRAGMENT_VARIANTS = ('card', 'card_dashboard', 'detail', 'detail_dashboard')
+
+LOCK_POLL_SECONDS = 0.05
+
+
+def fragment_key(complaint_id, updated_at, variant):
+    return f'fragment:complaint:{complaint_id}:{updated_at.timestamp():.6f}:{variant}'
+
+
+def get_or_render(complaint, variant, render):
+    """Return cached HTML for the fragment, calling render() at most once per key."""
+    key = fragment_key(complaint.pk, complaint.updated_at, variant)
+    html = cache.get(key)
+    if html is not None:
+        return html
+
+    lock_key = f'{key}:lock'
+    lock_timeout = settings.FRAGMENT_LOCK_TIMEOUT_SECONDS
+    if not cache.add(lock_key, 1, lock_timeout):
+        # Someone else is rendering this key: wait for their result
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            html = cache.get(key)
+            if html is not None:
+                return html
+        # The holder died or is very slow; render without caching
+        return render()
+
+    try:
+        html = render()
+        cache.set(key, html, settings.FRAGMENT_CACHE_SECONDS)
+        return html
+    finally:
+        cache.delete(lock_key)
+
+
+def invalidate_fragments(complaint_id, updated_at):
+    """Drop every cached variant for one version of a complaint."""
+    if updated_at is None:
+        return
+    cache.delete_many([
+        fragment_key(complaint_id, updated_at, variant)
+        for variant in FRAGMENT_VARIANTS
+    ])
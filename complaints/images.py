@@ -0,0 +1,118 @@
+"""
+Post-upload processing for complaint evidence images.
+
+Runs in the background after a complaint is saved (see
+schedule_image_processing) or from the process_complaint_images command:
+
+- the original is re-encoded without EXIF/XMP metadata (GPS included),
+  after applying the EXIF orientation so it still displays upright;
+- bounded WebP variants are written for IMAGE_VARIANT_WIDTHS, for use
+  in srcset;
+- the pixel dimensions are recorded on the complaint.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from config.background import run_after_commit
+
+from .models import Complaint
+
+VARIANT_DIR = 'complaints/images/variants'
+
+# Uploads are already checked against this by the form's header probe;
+# this stops Pillow decoding anything larger that reached storage another way
+Image.MAX_IMAGE_PIXELS = settings.MAX_IMAGE_PIXELS
+
+
+def strip_metadata(image, image_format):
+    """Re-encode the (already orientation-corrected) image with no metadata."""
+    buffer = io.BytesIO()
+    # Only the colour profile is carried over; exif, xmp and comments are dropped
+    icc_profile = image.info.get('icc_profile')
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if image_format == 'PNG':
+        image.save(buffer, 'PNG', optimize=True, **options)
+        return buffer.getvalue(), 'png'
+    if image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=90, **options)
+        return buffer.getvalue(), 'webp'
+    if image.mode not in ('RGB', 'L', 'CMYK'):
+        image = image.convert('RGB')
+    image.save(buffer, 'JPEG', quality=90, optimize=True, progressive=True, **options)
+    return buffer.getvalue(), 'jpg'
+
+
+def make_variant(image, width):
+    """WebP copy that fits in a width x width box."""
+    variant = image.copy()
+    variant.thumbnail((width, width), Image.LANCZOS)
+    if variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGBA' if 'A' in variant.getbands() else 'RGB')
+    buffer = io.BytesIO()
+    variant.save(buffer, 'WEBP', quality=80, method=4)
+    return buffer.getvalue(), variant.width
+
+
+def process_image(complaint):
+    """Strip, resize and record one complaint's image. Returns False if skipped."""
+    field = complaint.image_file
+    if not field or complaint.image_processed:
+        return False
+    storage = field.storage
+
+    with field.open('rb') as source:
+        image = Image.open(source)
+        image_format = image.format
+        image.load()
+    image = ImageOps.exif_transpose(image)
+
+    stem = os.path.splitext(os.path.basename(field.name))[0]
+    stripped, extension = strip_metadata(image, image_format)
+    # Under upload_to, not the current name's directory: that already holds
+    # the aa/bb hash shard, which storage adds again
+    original_name = storage.save(
+        field.field.generate_filename(complaint, f'{stem}.{extension}'),
+        ContentFile(stripped),
+        max_length=field.field.max_length,
+    )
+
+    variants = []
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        data, actual_width = make_variant(image, width)
+        name = storage.save(f'{VARIANT_DIR}/{stem}-{width}.webp', ContentFile(data))
+        variants.append([actual_width, name])
+        if max(image.size) <= width:
+            # The original fits in this box; larger variants would be identical
+            break
+
+    # Bumping updated_at refreshes cached detail fragments that embed the URLs
+    Complaint.objects.filter(pk=complaint.pk).update(
+        image_file=original_name,
+        image_width=image.width,
+        image_height=image.height,
+        image_variants=variants,
+        image_processed=True,
+        updated_at=timezone.now(),
+    )
+    # Release the previous original and variants (shared blobs just lose a reference)
+    storage.delete(field.name)
+    for _width, name in complaint.image_variants:
+        storage.delete(name)
+    return True
+
+
+def process_image_by_id(complaint_id):
+    complaint = Complaint.objects.filter(pk=complaint_id).first()
+    if complaint is not None:
+        process_image(complaint)
+
+
+def schedule_image_processing(complaint):
+    """Queue processing for a freshly saved complaint that has an image."""
+    if complaint.image_file and not complaint.image_processed:
+        run_after_commit(process_image_by_id, complaint.pk)
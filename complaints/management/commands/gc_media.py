@@ -0,0 +1,200 @@
+"""
+Management command to delete media files no complaint refers to.
+Usage: python manage.py gc_media [--grace-hours H] [--dry-run] [--chunk-size N]
+
+Deleting complaints (admin panel, seed_data --clear, bulk deletes) leaves
+their audio, images and image variants behind. This command:
+
+1. streams every referenced name from the database into a Bloom filter;
+2. walks MEDIA_ROOT with os.scandir, one directory at a time;
+3. deletes files the filter has never seen that are older than the
+   grace period, together with their MediaBlob row.
+
+A Bloom filter never misses a name that was added, so a referenced file
+is never treated as an orphan; a false positive only keeps an orphan
+until a later run. Memory is about 1.8 bytes per referenced name and
+does not depend on the number of files on disk.
+"""
+import hashlib
+import math
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from complaints.models import Complaint, MediaBlob
+from complaints.storage import INCOMING_DIR
+
+FALSE_POSITIVE_RATE = 0.001
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate=FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1000)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def referenced_names(complaints, chunk_size):
+    """Yield every storage name the given complaints point at."""
+    rows = complaints.values_list('audio_file', 'image_file', 'image_variants')
+    for audio, image, variants in rows.iterator(chunk_size=chunk_size):
+        if audio:
+            yield audio
+        if image:
+            yield image
+        for _width, name in variants or ():
+            yield name
+
+
+def walk_files(root):
+    """Yield (relative name, DirEntry) for every file under root, skipping uploads in flight."""
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative_dir))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                name = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name != INCOMING_DIR:
+                        stack.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield name, entry
+
+
+class Command(BaseCommand):
+    help = 'Delete media files that no complaint refers to'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Only delete files last modified at least this long ago (default: 24)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be deleted'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched, and orphans deleted, per round trip (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.chunk_size = options['chunk_size']
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        self.started = timezone.now()
+        self.root = str(settings.MEDIA_ROOT)
+        self.stats = {'scanned': 0, 'orphans': 0, 'deleted': 0, 'bytes': 0}
+
+        if not os.path.isdir(self.root):
+            self.stdout.write(f'{self.root} does not exist; nothing to do.')
+            return
+
+        # Upper bound on names per complaint: audio, image and every variant
+        per_complaint = 2 + len(settings.IMAGE_VARIANT_WIDTHS)
+        referenced = BloomFilter(Complaint.objects.count() * per_complaint)
+        count = 0
+        for name in referenced_names(Complaint.objects.all(), self.chunk_size):
+            referenced.add(name)
+            count += 1
+        self.stdout.write(
+            f'Indexed {count} referenced files in {len(referenced.bits) / 1024 / 1024:.1f} MB'
+        )
+
+        batch = []
+        for name, entry in walk_files(self.root):
+            self.stats['scanned'] += 1
+            if name in referenced:
+                continue
+            if entry.stat(follow_symlinks=False).st_mtime > self.cutoff:
+                continue
+            batch.append(name)
+            if len(batch) >= self.chunk_size:
+                self.collect(batch)
+                batch = []
+        if batch:
+            self.collect(batch)
+        self.clean_incoming()
+
+        stats = self.stats
+        action = 'Would delete' if self.dry_run else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} files, {stats['orphans']} orphaned. "
+            f"{action} {stats['deleted']} files ({stats['bytes'] / 1024 / 1024:.1f} MB)"
+        ))
+
+    def collect(self, names):
+        """Delete one batch of orphan candidates, re-checking for late references."""
+        # Complaints saved since the index was built are not in the filter
+        recent = set(referenced_names(Complaint.objects.filter(updated_at__gte=self.started), self.chunk_size))
+
+        deleted = []
+        for name in names:
+            if name in recent:
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            # A new upload of identical bytes touches the existing file
+            if stat.st_mtime > self.cutoff:
+                continue
+            self.stats['orphans'] += 1
+            if not self.dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            deleted.append(name)
+            self.stats['deleted'] += 1
+            self.stats['bytes'] += stat.st_size
+
+        if deleted and not self.dry_run:
+            MediaBlob.objects.filter(name__in=deleted).delete()
+
+    def clean_incoming(self):
+        """Remove temp files from uploads that died mid-write and abandoned resumable uploads."""
+        incoming = os.path.join(self.root, INCOMING_DIR)
+        if not os.path.isdir(incoming):
+            return
+        with os.scandir(incoming) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > self.cutoff:
+                    continue
+                if not self.dry_run:
+                    os.remove(entry.path)
+                self.stats['deleted'] += 1
+                self.stats['bytes'] += stat.st_size
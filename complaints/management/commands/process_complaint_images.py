@@ -0,0 +1,51 @@
+"""
+Management command to process uploaded evidence images.
+Usage: python manage.py process_complaint_images [--limit N] [--reprocess]
+
+Strips EXIF metadata, records dimensions and writes WebP variants for
+images the background worker has not handled yet (e.g. after a restart
+or for uploads that predate the pipeline).
+"""
+from django.core.management.base import BaseCommand
+
+from complaints.images import process_image
+from complaints.models import Complaint
+
+
+class Command(BaseCommand):
+    help = 'Strip metadata and build responsive variants for complaint images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of images to process'
+        )
+        parser.add_argument(
+            '--reprocess',
+            action='store_true',
+            help='Rebuild variants for images that were already processed'
+        )
+
+    def handle(self, *args, **options):
+        complaints = Complaint.objects.exclude(image_file='').exclude(image_file__isnull=True)
+        if not options['reprocess']:
+            complaints = complaints.filter(image_processed=False)
+        complaints = complaints.order_by('created_at')
+        if options['limit']:
+            complaints = complaints[:options['limit']]
+
+        processed = failed = 0
+        for complaint in complaints.iterator(chunk_size=200):
+            complaint.image_processed = False
+            try:
+                process_image(complaint)
+                processed += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'  ✗ {complaint.id}: {e}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} images'))
+        if failed:
+            self.stdout.write(self.style.ERROR(f'Failed: {failed}'))
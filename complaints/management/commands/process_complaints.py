@@ -1,7 +1,11 @@
 """Management command to process complaints with AI in batch."""
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.counters import adjust_user_counters
 from complaints.models import Complaint
 from ai_services.openai_service import OpenAIService
+from complaints.cards import render_stale_cards
+from pages.stats import refresh_public_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,6 +64,12 @@ class Command(BaseCommand):
                 failed_count += 1
                 self.stdout.write(self.style.ERROR(f'  ✗ Failed to process {complaint.id}: {str(e)}'))
 
+        # New AI-processed complaints show up on the landing page
+        if processed_count:
+            refresh_public_stats()
+            checked, rendered = render_stale_cards()
+            self.stdout.write(f'Share cards: {rendered} rendered, {checked - rendered} unchanged')
+
         # Summary
         self.stdout.write('\n' + '='*50)
         self.stdout.write(self.style.SUCCESS(f'Successfully processed: {processed_count}'))
@@ -69,6 +79,7 @@ class Command(BaseCommand):
 
     def _process_complaint(self, complaint, ai_service):
         """Process a single complaint with AI."""
+        was_processed = complaint.ai_processed
 
         # Step 1: Transcribe audio if present and not already transcribed
         if complaint.audio_file and '[Audio Transcription]' not in complaint.raw_text:
@@ -114,5 +125,10 @@ class Command(BaseCommand):
                 complaint.ai_processed = False
                 raise Exception(f'Analysis failed: {str(e)}')
 
-        # Save the updated complaint
-        complaint.save()
+        # Save the updated complaint and move the owner's pending counter
+        with transaction.atomic():
+            complaint.save()
+            adjust_user_counters(
+                complaint.user_id,
+                pending_complaints_count=int(was_processed) - int(complaint.ai_processed),
+            )
@@ -0,0 +1,212 @@
+"""
+Management command to publish anonymized complaint data as static files.
+Usage: python manage.py publish_open_data [--full]
+
+Writes one compressed file per day of complaints (CSV.gz, plus Parquet when
+pyarrow is installed) under OPEN_DATA_ROOT, together with a manifest.json
+that lists every partition. Only days whose row count or last update changed
+since the previous run are rewritten.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from complaints.models import Complaint
+
+MANIFEST_NAME = 'manifest.json'
+PARTITION_DIR = 'complaints/daily'
+
+# Published columns. Free text, officer names and the submitting user are
+# never exported; timestamps are coarsened to the day.
+OPEN_DATA_FIELDS = [
+    'id',
+    'created_date',
+    'category',
+    'county',
+    'urgency',
+    'sentiment',
+    'department_name',
+    'is_verified',
+    'ai_processed',
+    'has_audio',
+    'has_image',
+]
+
+
+class Command(BaseCommand):
+    help = 'Publish anonymized daily complaint partitions and a manifest for open data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rewrite every partition, even if unchanged'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched per database round trip (default: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        self.root = str(settings.OPEN_DATA_ROOT)
+        self.chunk_size = options['chunk_size']
+        os.makedirs(self.root, exist_ok=True)
+
+        try:
+            import pyarrow  # noqa: F401
+            self.write_parquet = True
+        except ImportError:
+            self.write_parquet = False
+            self.stdout.write(self.style.WARNING('pyarrow not installed - skipping Parquet files'))
+
+        manifest = self.load_manifest()
+        published = manifest.get('partitions', {})
+
+        # One grouped scan gives every day's row count and last update.
+        # A partition is stale when either differs from the manifest.
+        current = {
+            row['day'].isoformat(): row
+            for row in Complaint.objects.annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(rows=Count('pk'), last_updated=Max('updated_at'))
+            .order_by()
+        }
+
+        written = 0
+        for day_key, row in sorted(current.items()):
+            previous = published.get(day_key)
+            fingerprint = {
+                'rows': row['rows'],
+                'last_updated': row['last_updated'].isoformat(),
+            }
+            if (not options['full'] and previous
+                    and previous['rows'] == fingerprint['rows']
+                    and previous['last_updated'] == fingerprint['last_updated']
+                    and (previous['files'].get('parquet') or not self.write_parquet)):
+                continue
+
+            files = self.publish_partition(row['day'])
+            if previous:
+                self.remove_files(previous['files'], keep=files)
+            published[day_key] = {**fingerprint, 'files': files}
+            written += 1
+            self.stdout.write(f'  - {day_key}: {row["rows"]} complaints')
+
+        removed = 0
+        for day_key in sorted(set(published) - set(current)):
+            self.remove_files(published.pop(day_key)['files'])
+            removed += 1
+
+        manifest = {
+            'dataset': 'sauti-ya-wananchi-complaints',
+            'generated_at': timezone.now().isoformat(),
+            'timezone': settings.TIME_ZONE,
+            'base_url': settings.OPEN_DATA_URL,
+            'fields': OPEN_DATA_FIELDS,
+            'partitions': dict(sorted(published.items())),
+        }
+        self.write_atomic(MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Published {written} partitions ({len(current) - written} unchanged, {removed} removed)'
+        ))
+
+    def load_manifest(self):
+        """Read the previous run's manifest, if any."""
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME), 'rb') as manifest_file:
+                return json.load(manifest_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def partition_rows(self, day):
+        """Yield anonymized rows for one local calendar day."""
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = start + timedelta(days=1)
+        rows = (
+            Complaint.objects.filter(created_at__gte=start, created_at__lt=end)
+            .order_by('created_at', 'id')
+            .values_list(
+                'id', 'category', 'county', 'urgency', 'sentiment',
+                'department_name', 'is_verified', 'ai_processed',
+                'audio_file', 'image_file',
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        day_str = day.isoformat()
+        for (pk, category, county, urgency, sentiment, department,
+             is_verified, ai_processed, audio_file, image_file) in rows:
+            yield [
+                str(pk), day_str, category, county, urgency, sentiment,
+                department, is_verified, ai_processed,
+                bool(audio_file), bool(image_file),
+            ]
+
+    def publish_partition(self, day):
+        """Write the files for one day and return their manifest entries."""
+        rows = list(self.partition_rows(day))
+        base = f'{PARTITION_DIR}/{day:%Y/%m}/complaints-{day.isoformat()}'
+
+        files = {'csv_gz': self.write_hashed(base, 'csv.gz', self.encode_csv_gz(rows))}
+        if self.write_parquet:
+            files['parquet'] = self.write_hashed(base, 'parquet', self.encode_parquet(rows))
+        return files
+
+    def encode_csv_gz(self, rows):
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(OPEN_DATA_FIELDS)
+        writer.writerows(rows)
+        # mtime=0 keeps the output byte-identical for identical data
+        return gzip.compress(text.getvalue().encode('utf-8'), compresslevel=9, mtime=0)
+
+    def encode_parquet(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = list(zip(*rows)) if rows else [[] for _ in OPEN_DATA_FIELDS]
+        table = pa.table({
+            name: pa.array(values, type=pa.bool_() if name.startswith(('is_', 'ai_', 'has_')) else pa.string())
+            for name, values in zip(OPEN_DATA_FIELDS, columns)
+        })
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression='zstd')
+        return buffer.getvalue()
+
+    def write_hashed(self, base, extension, data):
+        """Store data under a content-hashed name so it can be cached forever."""
+        digest = hashlib.sha256(data).hexdigest()
+        relative_path = f'{base}.{digest[:12]}.{extension}'
+        self.write_atomic(relative_path, data)
+        return {'path': relative_path, 'sha256': digest, 'bytes': len(data)}
+
+    def write_atomic(self, relative_path, data):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as output:
+            output.write(data)
+        os.replace(tmp_path, path)
+
+    def remove_files(self, files, keep=None):
+        """Delete superseded partition files (same content is kept)."""
+        keep_paths = {entry['path'] for entry in (keep or {}).values()}
+        for entry in files.values():
+            if entry['path'] in keep_paths:
+                continue
+            try:
+                os.remove(os.path.join(self.root, entry['path']))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,47 @@
+"""
+Management command to render Open Graph images for shareable complaint cards.
+Usage: python manage.py render_card_images [--limit N] [--all]
+
+Only complaints updated since their card was last checked are examined,
+and only those whose visible card fields changed are redrawn. Views
+already queue renders on processing/verification; run this on a schedule
+to catch anything those missed.
+"""
+from django.core.management.base import BaseCommand
+
+from complaints.cards import render_card, render_stale_cards
+from complaints.models import Complaint
+
+
+class Command(BaseCommand):
+    help = 'Render PNG/WebP share-card images for processed complaints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of complaints to check'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Redraw every processed complaint, even if unchanged'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            complaints = Complaint.objects.filter(ai_processed=True).order_by('created_at')
+            if options['limit']:
+                complaints = complaints[:options['limit']]
+            checked = 0
+            for complaint in complaints.iterator(chunk_size=500):
+                render_card(complaint, force=True)
+                checked += 1
+            rendered = checked
+        else:
+            checked, rendered = render_stale_cards(limit=options['limit'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} cards: {rendered} rendered, {checked - rendered} unchanged'
+        ))
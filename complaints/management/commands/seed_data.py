@@ -1,16 +1,100 @@
 """
 Management command to seed the database with sample data.
 Usage: python manage.py seed_data [--clear]
+       python manage.py seed_data --count 1000000 --users 5000 [--seed 42]
+
+Without --count a dozen hand-written complaints are created. With --count,
+synthetic complaints are generated with realistic distributions and loaded
+in chunks (Postgres COPY when available, bulk_create otherwise), so large
+benchmark databases are reproducible from the same seed.
 """
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from complaints.forms import KENYA_COUNTIES
 from complaints.models import Complaint
+from accounts.counters import recount_user_stats
+from pages.stats import refresh_public_stats
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import csv
+import io
+import itertools
+import json
+import math
 import random
+import time
+import uuid
 
 User = get_user_model()
 
+# Relative weights, roughly proportional to county population (2019 census)
+COUNTY_WEIGHTS = {
+    'nairobi': 4397, 'kiambu': 2417, 'nakuru': 2162, 'kakamega': 1867,
+    'bungoma': 1670, 'meru': 1545, 'kilifi': 1453, 'machakos': 1421,
+    'kisii': 1266, 'mombasa': 1208, 'uasin_gishu': 1163, 'narok': 1157,
+    'kisumu': 1155, 'kitui': 1136, 'homa_bay': 1131, 'kajiado': 1117,
+    'migori': 1116, 'muranga': 1056, 'siaya': 993, 'trans_nzoia': 990,
+    'makueni': 987, 'turkana': 926, 'kericho': 901, 'busia': 893,
+    'nandi': 885, 'bomet': 875, 'mandera': 867, 'kwale': 866,
+    'garissa': 841, 'wajir': 781, 'nyeri': 759, 'baringo': 666,
+    'nyandarua': 638, 'west_pokot': 621, 'kirinyaga': 610, 'embu': 608,
+    'nyamira': 605, 'vihiga': 590, 'laikipia': 518, 'marsabit': 459,
+    'elgeyo_marakwet': 454, 'tharaka_nithi': 393, 'taita_taveta': 340,
+    'tana_river': 315, 'samburu': 310, 'isiolo': 268, 'lamu': 143,
+}
+CATEGORY_WEIGHTS = {
+    'delay': 30, 'bribery': 20, 'corruption': 15, 'infrastructure_damage': 15,
+    'misconduct': 10, 'lost_documents': 5, 'other': 5,
+}
+URGENCY_WEIGHTS = {'low': 15, 'medium': 45, 'high': 30, 'critical': 10}
+SENTIMENTS = ['negative', 'negative', 'negative', 'neutral', 'positive']
+# Submissions by hour of day (Nairobi time): quiet nights, busy office hours
+HOURLY_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 6, 8, 9, 9, 8, 7, 8, 8, 8, 7, 7, 6, 5, 4, 3, 2, 1]
+
+TEXT_FRAGMENTS = [
+    'I went to the county office to get my documents processed.',
+    'The officer demanded money before he could help me.',
+    'We have waited for more than three months without any response.',
+    'The road in our area has huge potholes that cause accidents.',
+    'Nobody answers the phone at the department.',
+    'They told me to come back tomorrow every single time.',
+    'This is affecting many families in the village.',
+    'Water supply has been cut for two weeks without explanation.',
+    'Hospital staff asked for payment before treating an emergency.',
+    'My land title documents were lost by the registry.',
+    'The chief is allocating plots to people who pay him.',
+    'Garbage has not been collected in our estate for weeks.',
+    'Streetlights have been off for months and muggings have increased.',
+    'Tafadhali saidieni, hali hii imekuwa mbaya sana.',
+]
+
+# Columns written for synthetic complaints (COPY and bulk_create)
+SYNTHETIC_COLUMNS = [
+    'id', 'user_id', 'is_anonymous', 'raw_text', 'summary', 'category',
+    'county', 'urgency', 'sentiment', 'audio_file', 'image_file',
+    'officer_name', 'department_name', 'channel', 'external_id',
+    'ai_processed', 'is_verified', 'created_at', 'updated_at',
+    # NOT NULL without a database default (AddField drops it), so COPY must list them
+    'card_fingerprint', 'card_image_png', 'card_image_webp',
+    'image_processed', 'image_variants',
+]
+
+
+@contextmanager
+def explicit_timestamps():
+    """Let bulk_create keep the generated created_at/updated_at values."""
+    created = Complaint._meta.get_field('created_at')
+    updated = Complaint._meta.get_field('updated_at')
+    created.auto_now_add, updated.auto_now = False, False
+    try:
+        yield
+    finally:
+        created.auto_now_add, updated.auto_now = True, True
+
 
 class Command(BaseCommand):
     help = 'Seeds the database with sample complaints and users'
@@ -21,6 +105,36 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete existing data before seeding',
         )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=0,
+            help='Generate this many synthetic complaints instead of the samples',
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100,
+            help='Synthetic citizen accounts to spread complaints over (default: 100)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Spread synthetic complaints over this many past days (default: 365)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for reproducible data (default: 42)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Rows written per COPY/bulk_create chunk (default: 10000)',
+        )
 
     def handle(self, *args, **options):
         import os
@@ -38,11 +152,18 @@ class Command(BaseCommand):
 
         self.stdout.write('Seeding database...')
 
-        # Create sample users
-        users = self.create_users()
+        if options['count']:
+            self.create_synthetic_data(options)
+        else:
+            # Create sample users
+            users = self.create_users()
+
+            # Create sample complaints
+            self.create_complaints(users)
 
-        # Create sample complaints
-        self.create_complaints(users)
+        # Seeded rows bypass the submit views, so rebuild the user counters
+        recount_user_stats()
+        refresh_public_stats()
 
         self.stdout.write(self.style.SUCCESS('Database seeded successfully!'))
         self.stdout.write(self.style.SUCCESS(f'Created {User.objects.count()} users'))
@@ -265,3 +386,152 @@ class Command(BaseCommand):
             created_count += 1
 
         self.stdout.write(self.style.SUCCESS(f'Created {created_count} complaints'))
+
+    def create_synthetic_data(self, options):
+        """Generate options['count'] complaints over options['users'] citizens."""
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        user_ids = self.create_synthetic_users(options['users'], options['seed'])
+        self.stdout.write(f'Generating {options["count"]:,} complaints...')
+
+        use_copy = connection.vendor == 'postgresql'
+        rows = self.synthetic_rows(rng, options['count'], user_ids, options['days'])
+        chunk_size = options['chunk_size']
+        written = 0
+        while written < options['count']:
+            chunk = [next(rows) for _ in range(min(chunk_size, options['count'] - written))]
+            with transaction.atomic():
+                if use_copy:
+                    self.copy_chunk(chunk)
+                else:
+                    with explicit_timestamps():
+                        Complaint.objects.bulk_create(
+                            [Complaint(**dict(zip(SYNTHETIC_COLUMNS, row))) for row in chunk]
+                        )
+            written += len(chunk)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'  {written:,} rows ({written / elapsed:,.0f} rows/s)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {written:,} synthetic complaints in {time.perf_counter() - started:.1f}s '
+            f'via {"COPY" if use_copy else "bulk_create"}'
+        ))
+
+    def create_synthetic_users(self, count, seed):
+        """Bulk-create citizen_NNNNNN accounts and return their ids."""
+        if count <= 0:
+            return []
+        self.stdout.write(f'Creating {count:,} synthetic users...')
+        # Hash once: every synthetic account shares the password "password123"
+        password = make_password('password123')
+        rng = random.Random(seed + 1)
+        counties = [name for slug, name in KENYA_COUNTIES if slug]
+        usernames = [f'citizen_{i:06d}' for i in range(count)]
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=f'{username}@example.com',
+                    password=password,
+                    role='citizen',
+                    county=rng.choice(counties),
+                )
+                for username in usernames
+            ],
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+        return list(User.objects.filter(username__in=usernames).values_list('pk', flat=True))
+
+    def synthetic_rows(self, rng, count, user_ids, days):
+        """Yield complaint rows in SYNTHETIC_COLUMNS order."""
+        # Cumulative weights let random.choices skip re-summing on every draw
+        counties = list(COUNTY_WEIGHTS)
+        county_weights = list(itertools.accumulate(COUNTY_WEIGHTS.values()))
+        categories = list(CATEGORY_WEIGHTS)
+        category_weights = list(itertools.accumulate(CATEGORY_WEIGHTS.values()))
+        urgencies = list(URGENCY_WEIGHTS)
+        urgency_weights = list(itertools.accumulate(URGENCY_WEIGHTS.values()))
+        hours = list(range(24))
+        hour_weights = list(itertools.accumulate(HOURLY_WEIGHTS))
+        now = timezone.now()
+        start_of_today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        for _ in range(count):
+            # Text length is log-normal: most reports are short, a few are long
+            target_length = min(int(rng.lognormvariate(math.log(250), 0.7)), 4000)
+            parts = []
+            length = 0
+            while length < target_length:
+                fragment = rng.choice(TEXT_FRAGMENTS)
+                parts.append(fragment)
+                length += len(fragment) + 1
+            raw_text = ' '.join(parts)
+
+            # Recent days are busier than older ones (growing platform)
+            days_ago = int(rng.betavariate(1, 1.6) * days)
+            created_at = start_of_today - timedelta(
+                days=days_ago,
+                hours=-rng.choices(hours, cum_weights=hour_weights)[0],
+                seconds=-rng.randrange(3600),
+            )
+            if created_at > now:
+                created_at = now - timedelta(seconds=rng.randrange(3600))
+
+            ai_processed = rng.random() < 0.85
+            user_id = rng.choice(user_ids) if user_ids and rng.random() < 0.6 else None
+
+            yield (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                user_id,
+                user_id is None,
+                raw_text,
+                raw_text[:rng.randint(120, 300)] if ai_processed else '',
+                rng.choices(categories, cum_weights=category_weights)[0],
+                rng.choices(counties, cum_weights=county_weights)[0],
+                rng.choices(urgencies, cum_weights=urgency_weights)[0],
+                rng.choice(SENTIMENTS) if ai_processed else '',
+                'complaints/audio/synthetic.webm' if rng.random() < 0.1 else '',
+                'complaints/images/synthetic.jpg' if rng.random() < 0.2 else '',
+                '',
+                '',
+                'web',
+                '',
+                ai_processed,
+                ai_processed and rng.random() < 0.35,
+                created_at,
+                created_at,
+                '',
+                '',
+                '',
+                False,
+                [],
+            )
+
+    @staticmethod
+    def copy_value(value):
+        """Format one value as COPY csv text."""
+        if value is None:
+            return r'\N'
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, list):
+            # JSONField column; bulk_create gets the list itself
+            return json.dumps(value)
+        return value
+
+    def copy_chunk(self, chunk):
+        """Stream a chunk into Postgres with COPY ... FROM STDIN."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow([self.copy_value(value) for value in row])
+        buffer.seek(0)
+        table = Complaint._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f'COPY {table} ({", ".join(SYNTHETIC_COLUMNS)}) '
+                f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
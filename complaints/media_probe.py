@@ -0,0 +1,393 @@
+"""
+Header-only probing of uploaded audio and images.
+
+Reads just the container headers (plus the last Ogg page for Ogg
+duration) to find the real format, pixel dimensions or duration, so bad
+uploads can be rejected before they are saved, decoded or sent to an
+AI provider. Nothing here decodes image pixels or audio samples.
+
+Supported: WAV, Ogg (Vorbis/Opus), WebM/Matroska, MP3; JPEG, PNG, WebP.
+"""
+import struct
+from collections import namedtuple
+
+MediaInfo = namedtuple('MediaInfo', ['format', 'content_type', 'width', 'height', 'duration'])
+
+# Upper bound on JPEG/EBML elements walked before giving up
+MAX_SEGMENTS = 256
+OGG_MAX_PAGE = 65307
+# WebM without a Duration is estimated from its last Cluster, searched
+# for backwards from the end of the file a window at a time
+WEBM_CLUSTER_ID = b'\x1f\x43\xb6\x75'
+WEBM_TAIL_WINDOW = 1 << 20
+MAX_CLUSTER_CHILDREN = 8192
+
+
+class ProbeError(ValueError):
+    """The file is not a supported format or its header is malformed."""
+
+
+def _read(f, size):
+    data = f.read(size)
+    if len(data) < size:
+        raise ProbeError('File is truncated.')
+    return data
+
+
+def _file_size(f):
+    size = getattr(f, 'size', None)
+    if size is None:
+        position = f.tell()
+        size = f.seek(0, 2)
+        f.seek(position)
+    return size
+
+
+# Images -------------------------------------------------------------------
+
+# SOF markers carry the frame dimensions; C4, C8 and CC are not frames
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_dimensions(f):
+    f.seek(2)
+    for _ in range(MAX_SEGMENTS):
+        byte = _read(f, 1)
+        if byte != b'\xff':
+            raise ProbeError('Corrupt JPEG marker.')
+        marker = _read(f, 1)[0]
+        while marker == 0xFF:  # fill bytes
+            marker = _read(f, 1)[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):
+            break
+        length = struct.unpack('>H', _read(f, 2))[0]
+        if length < 2:
+            raise ProbeError('Corrupt JPEG segment.')
+        if marker in JPEG_SOF_MARKERS:
+            _precision, height, width = struct.unpack('>BHH', _read(f, 5))
+            return width, height
+        f.seek(length - 2, 1)
+    raise ProbeError('JPEG has no frame header.')
+
+
+def probe_image(f):
+    """Return MediaInfo with width/height for a JPEG, PNG or WebP file."""
+    f.seek(0)
+    head = f.read(32)
+
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(head) < 24 or head[12:16] != b'IHDR':
+            raise ProbeError('PNG has no IHDR chunk.')
+        width, height = struct.unpack('>II', head[16:24])
+        info = MediaInfo('png', 'image/png', width, height, None)
+
+    elif head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b'VP8 ':
+            if head[23:26] != b'\x9d\x01\x2a':
+                raise ProbeError('Corrupt WebP frame header.')
+            width, height = struct.unpack('<HH', head[26:30])
+            width, height = width & 0x3FFF, height & 0x3FFF
+        elif chunk == b'VP8L':
+            if head[20] != 0x2F:
+                raise ProbeError('Corrupt lossless WebP header.')
+            bits = int.from_bytes(head[21:25], 'little')
+            width, height = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        elif chunk == b'VP8X':
+            width = int.from_bytes(head[24:27], 'little') + 1
+            height = int.from_bytes(head[27:30], 'little') + 1
+        else:
+            raise ProbeError('Unknown WebP chunk.')
+        info = MediaInfo('webp', 'image/webp', width, height, None)
+
+    elif head[:2] == b'\xff\xd8':
+        width, height = _jpeg_dimensions(f)
+        info = MediaInfo('jpeg', 'image/jpeg', width, height, None)
+
+    else:
+        raise ProbeError('Not a JPEG, PNG or WebP image.')
+
+    f.seek(0)
+    if not info.width or not info.height:
+        raise ProbeError('Image has zero size.')
+    return info
+
+
+# Audio --------------------------------------------------------------------
+
+def _wav_duration(f):
+    f.seek(12)
+    byte_rate = None
+    for _ in range(MAX_SEGMENTS):
+        chunk_id, chunk_size = struct.unpack('<4sI', _read(f, 8))
+        if chunk_id == b'fmt ':
+            _fmt, _channels, _rate, byte_rate = struct.unpack('<HHII', _read(f, 12))
+            f.seek(chunk_size - 12 + chunk_size % 2, 1)
+        elif chunk_id == b'data':
+            if not byte_rate:
+                raise ProbeError('WAV data before fmt chunk.')
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF
+            if chunk_size in (0, 0xFFFFFFFF):
+                chunk_size = _file_size(f) - f.tell()
+            return chunk_size / byte_rate
+        else:
+            f.seek(chunk_size + chunk_size % 2, 1)
+    raise ProbeError('WAV has no data chunk.')
+
+
+def _ogg_duration(f):
+    f.seek(0)
+    header = _read(f, 27)
+    segments = _read(f, header[26])
+    packet = f.read(min(sum(segments), 64))
+    if packet.startswith(b'\x01vorbis'):
+        rate = struct.unpack('<I', packet[12:16])[0]
+        pre_skip = 0
+    elif packet.startswith(b'OpusHead'):
+        rate = 48000  # Opus granule positions are always 48 kHz
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+    else:
+        raise ProbeError('Unsupported Ogg codec.')
+    if not rate:
+        raise ProbeError('Corrupt Ogg header.')
+
+    # The last page's granule position is the total sample count
+    size = _file_size(f)
+    f.seek(max(0, size - OGG_MAX_PAGE))
+    tail = f.read()
+    last_page = tail.rfind(b'OggS')
+    if last_page < 0 or len(tail) < last_page + 14:
+        raise ProbeError('Ogg stream has no final page.')
+    granule = struct.unpack('<q', tail[last_page + 6:last_page + 14])[0]
+    return max(granule - pre_skip, 0) / rate
+
+
+def _ebml_vint(f, keep_marker=False):
+    first = _read(f, 1)[0]
+    if not first:
+        raise ProbeError('Corrupt EBML length.')
+    length = 8 - first.bit_length() + 1
+    value = first if keep_marker else first & (0xFF >> length)
+    rest = _read(f, length - 1)
+    unknown = not keep_marker and value == (0xFF >> length) and rest == b'\xff' * (length - 1)
+    for byte in rest:
+        value = (value << 8) | byte
+    return (None if unknown else value), length
+
+
+def _ebml_size(f, limit):
+    """Read an element size; unknown sizes are None, sizes past limit are rejected."""
+    size, _ = _ebml_vint(f)
+    if size is not None and size > limit - f.tell():
+        raise ProbeError('EBML element runs past its parent.')
+    return size
+
+
+def _webm_duration(f):
+    file_size = _file_size(f)
+    f.seek(0)
+    # EBML header
+    _ebml_vint(f, keep_marker=True)
+    size = _ebml_size(f, file_size)
+    if size is None:
+        raise ProbeError('Corrupt EBML header.')
+    f.seek(size, 1)
+
+    element_id, _ = _ebml_vint(f, keep_marker=True)
+    if element_id != 0x18538067:
+        raise ProbeError('WebM has no Segment.')
+    _ebml_size(f, file_size)
+
+    timecode_scale = 1000000
+    for _ in range(MAX_SEGMENTS):
+        offset = f.tell()
+        element_id, _ = _ebml_vint(f, keep_marker=True)
+        size = _ebml_size(f, file_size)
+        if element_id == 0x1549A966 and size is not None:  # Info
+            end = f.tell() + size
+            duration = None
+            while f.tell() < end:
+                child_id, _ = _ebml_vint(f, keep_marker=True)
+                child_size = _ebml_size(f, end)
+                if child_size is None:
+                    raise ProbeError('Corrupt WebM Info.')
+                if child_id == 0x2AD7B1:  # TimecodeScale
+                    if not 1 <= child_size <= 8:
+                        raise ProbeError('Corrupt WebM TimecodeScale.')
+                    timecode_scale = int.from_bytes(_read(f, child_size), 'big')
+                elif child_id == 0x4489:  # Duration
+                    if child_size not in (4, 8):
+                        raise ProbeError('Corrupt WebM Duration.')
+                    data = _read(f, child_size)
+                    duration = struct.unpack('>f' if child_size == 4 else '>d', data)[0]
+                else:
+                    f.seek(child_size, 1)
+            if duration is not None:
+                return duration * timecode_scale / 1e9
+            # A MediaRecorder stream: the length was not known when Info was written
+            continue
+        if element_id == 0x1F43B675:  # Cluster: media data starts
+            return _webm_estimated_duration(f, offset, file_size, timecode_scale)
+        if size is None:
+            return None
+        f.seek(size, 1)
+    return None
+
+
+def _webm_cluster_offsets(f, start, file_size):
+    """Offsets of Cluster IDs at or after start, last first."""
+    end = file_size
+    while end > start:
+        window_start = max(start, end - WEBM_TAIL_WINDOW)
+        f.seek(window_start)
+        # Overlap the next window by an ID so one split across them is found
+        window = f.read(min(end + len(WEBM_CLUSTER_ID), file_size) - window_start)
+        found = window.rfind(WEBM_CLUSTER_ID, 0, end - window_start + len(WEBM_CLUSTER_ID) - 1)
+        while found >= 0:
+            yield window_start + found
+            found = window.rfind(WEBM_CLUSTER_ID, 0, found)
+        end = window_start
+
+
+def _webm_cluster_end_time(f, offset, file_size):
+    """
+    Timecode of the last block in the Cluster at offset, or None when the
+    bytes there are not a Cluster (the ID also turns up inside frames).
+    """
+    f.seek(offset + len(WEBM_CLUSTER_ID))
+    try:
+        size = _ebml_size(f, file_size)
+        end = file_size if size is None else f.tell() + size
+        child_id, _ = _ebml_vint(f, keep_marker=True)
+        child_size = _ebml_size(f, end)
+    except ProbeError:
+        return None
+    # Timecode comes first in every Cluster a muxer writes
+    if child_id != 0xE7 or child_size is None or not 1 <= child_size <= 8:
+        return None
+    cluster_time = int.from_bytes(_read(f, child_size), 'big')
+
+    block_time = 0
+    try:
+        for _ in range(MAX_CLUSTER_CHILDREN):
+            if f.tell() >= end:
+                break
+            child_start = f.tell()
+            child_id, _ = _ebml_vint(f, keep_marker=True)
+            if child_id > 0xFFFFFF:  # a top-level element: the Cluster has ended
+                break
+            child_size = _ebml_size(f, end)
+            if child_size is None:
+                break
+            if child_id == 0xA0:  # BlockGroup: walk into it for its Block
+                continue
+            if child_id in (0xA1, 0xA3):  # Block, SimpleBlock
+                data_start = f.tell()
+                _ebml_vint(f)  # track number
+                if f.tell() + 2 > data_start + child_size:
+                    break
+                block_time = max(block_time, struct.unpack('>h', _read(f, 2))[0])
+                f.seek(data_start + child_size)
+            else:
+                f.seek(child_size, 1)
+            if f.tell() <= child_start:
+                break
+    except ProbeError:
+        # A recording cut off mid-block still has the blocks before it
+        pass
+    return cluster_time + block_time
+
+
+def _webm_estimated_duration(f, first_cluster, file_size, timecode_scale):
+    """Duration up to the start of the last block, for WebM without a Duration."""
+    offsets = _webm_cluster_offsets(f, first_cluster, file_size)
+    for _, offset in zip(range(MAX_SEGMENTS), offsets):
+        end_time = _webm_cluster_end_time(f, offset, file_size)
+        if end_time is not None:
+            return end_time * timecode_scale / 1e9
+    return None
+
+
+MP3_BITRATES = {
+    (3, 3): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (3, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (3, 1): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 3): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_duration(f, size):
+    f.seek(0)
+    offset = 0
+    head = f.read(10)
+    if head[:3] == b'ID3' and len(head) == 10:
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+    # Find the first frame sync within a few KB of the tag
+    f.seek(offset)
+    window = f.read(4096)
+    for i in range(len(window) - 3):
+        if window[i] == 0xFF and window[i + 1] & 0xE0 == 0xE0:
+            b1, b2, b3 = window[i + 1], window[i + 2], window[i + 3]
+            version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+            bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 3
+            if version != 1 and layer and 0 < bitrate_index < 15 and rate_index < 3:
+                break
+    else:
+        raise ProbeError('No MP3 frame found.')
+
+    frame_start = offset + i
+    rate = MP3_SAMPLE_RATES[version][rate_index]
+    table = (3, layer) if version == 3 else (2, 3 if layer == 3 else 2)
+    bitrate = MP3_BITRATES[table][bitrate_index]
+    if layer == 3:
+        samples_per_frame = 384
+    elif layer == 2 or version == 3:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+
+    # VBR files carry a Xing/Info (or VBRI) header with the frame count
+    mono = (b3 >> 6) == 3
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    f.seek(frame_start + 4 + side_info)
+    xing = f.read(12)
+    if xing[:4] in (b'Xing', b'Info') and struct.unpack('>I', xing[4:8])[0] & 1:
+        return struct.unpack('>I', xing[8:12])[0] * samples_per_frame / rate
+    f.seek(frame_start + 36)
+    vbri = f.read(18)
+    if vbri[:4] == b'VBRI':
+        return struct.unpack('>I', vbri[14:18])[0] * samples_per_frame / rate
+
+    return (size - frame_start) * 8 / (bitrate * 1000)
+
+
+def probe_audio(f):
+    """
+    Return MediaInfo with the duration (seconds) of a WAV, Ogg, WebM or
+    MP3 file. WebM written by a browser MediaRecorder records no duration;
+    it is estimated from the last Cluster, and is None if none is found.
+    """
+    f.seek(0)
+    head = f.read(12)
+    size = _file_size(f)
+    try:
+        if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+            info = MediaInfo('wav', 'audio/wav', None, None, _wav_duration(f))
+        elif head[:4] == b'OggS':
+            info = MediaInfo('ogg', 'audio/ogg', None, None, _ogg_duration(f))
+        elif head[:4] == b'\x1a\x45\xdf\xa3':
+            info = MediaInfo('webm', 'audio/webm', None, None, _webm_duration(f))
+        elif head[:3] == b'ID3' or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+            info = MediaInfo('mp3', 'audio/mpeg', None, None, _mp3_duration(f, size))
+        else:
+            raise ProbeError('Not a WAV, OGG, WebM or MP3 file.')
+    except (struct.error, IndexError, KeyError) as e:
+        raise ProbeError(f'Corrupt audio header ({e}).')
+    f.seek(0)
+    return info
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("complaints", "0002_complaint_is_anonymous_complaint_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="complaint",
+            name="channel",
+            field=models.CharField(
+                choices=[
+                    ("web", "Web Form"),
+                    ("sms", "SMS Gateway"),
+                    ("ussd", "USSD Gateway"),
+                    ("field_office", "Field Office Spreadsheet"),
+                    ("partner", "Other Partner"),
+                ],
+                default="web",
+                help_text="Channel the complaint was received through",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="external_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Partner-side reference, unique per channel (used to drop resubmissions)",
+                max_length=100,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="complaint",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("external_id", ""), _negated=True),
+                fields=("channel", "external_id"),
+                name="unique_channel_external_id",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("complaints", "0003_complaint_channel_external_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="complaint_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("complaints", "0004_complaint_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="complaint",
+            name="card_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of the fields drawn on the card when it was last rendered",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="card_image_png",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="card_image_webp",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="card_version",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="updated_at of the complaint when its card was last checked",
+                null=True,
+            ),
+        ),
+    ]
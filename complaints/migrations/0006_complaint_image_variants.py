@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("complaints", "0005_complaint_card_images"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="complaint",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="image_processed",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="[width, storage name] pairs of WebP variants, smallest first",
+            ),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
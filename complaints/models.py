@@ -2,6 +2,8 @@ import uuid
 from django.db import models
 from django.conf import settings
 
+from .fragments import invalidate_fragments
+
 
 class Complaint(models.Model):
     """Core model for citizen complaints."""
@@ -17,6 +19,15 @@ class Complaint(models.Model):
         ('other', 'Other'),
     ]
 
+    # Intake channel choices
+    CHANNEL_CHOICES = [
+        ('web', 'Web Form'),
+        ('sms', 'SMS Gateway'),
+        ('ussd', 'USSD Gateway'),
+        ('field_office', 'Field Office Spreadsheet'),
+        ('partner', 'Other Partner'),
+    ]
+
     # Urgency choices
     URGENCY_CHOICES = [
         ('low', 'Low'),
@@ -81,6 +92,15 @@ class Complaint(models.Model):
         null=True,
         help_text="Evidence image"
     )
+    # Filled in by complaints.images once metadata is stripped and variants exist
+    image_processed = models.BooleanField(default=False)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_variants = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="[width, storage name] pairs of WebP variants, smallest first"
+    )
 
     # Optional identification
     officer_name = models.CharField(
@@ -94,6 +114,19 @@ class Complaint(models.Model):
         help_text="Department involved (if mentioned)"
     )
 
+    # Intake source
+    channel = models.CharField(
+        max_length=20,
+        choices=CHANNEL_CHOICES,
+        default='web',
+        help_text="Channel the complaint was received through"
+    )
+    external_id = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Partner-side reference, unique per channel (used to drop resubmissions)"
+    )
+
     # Processing status
     ai_processed = models.BooleanField(
         default=False,
@@ -104,6 +137,20 @@ class Complaint(models.Model):
         help_text="Whether complaint has been reviewed by admin"
     )
 
+    # Open Graph card images (paths under OPEN_DATA_ROOT, see complaints.cards)
+    card_image_png = models.CharField(max_length=255, blank=True)
+    card_image_webp = models.CharField(max_length=255, blank=True)
+    card_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the fields drawn on the card when it was last rendered"
+    )
+    card_version = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="updated_at of the complaint when its card was last checked"
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -112,6 +159,27 @@ class Complaint(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Complaint'
         verbose_name_plural = 'Complaints'
+        indexes = [
+            # Serves the default ordering and cursor pagination on the API
+            models.Index(fields=['-created_at', '-id'], name='complaint_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['channel', 'external_id'],
+                condition=~models.Q(external_id=''),
+                name='unique_channel_external_id',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # updated_at still holds the previous version until auto_now runs
+        previous_version = self.updated_at
+        super().save(*args, **kwargs)
+        invalidate_fragments(self.pk, previous_version)
+
+    def delete(self, *args, **kwargs):
+        invalidate_fragments(self.pk, self.updated_at)
+        return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.category} - {self.county} ({self.created_at.strftime('%Y-%m-%d')})"
@@ -123,7 +191,62 @@ class Complaint(models.Model):
             return self.summary[:150] + '...' if len(self.summary) > 150 else self.summary
         return self.raw_text[:150] + '...' if len(self.raw_text) > 150 else self.raw_text
 
+    @property
+    def card_image_url(self):
+        """Public URL of the rendered PNG card, or '' before the first render."""
+        if not self.card_image_png:
+            return ''
+        return settings.OPEN_DATA_URL.rstrip('/') + '/' + self.card_image_png
+
+    @property
+    def card_image_webp_url(self):
+        if not self.card_image_webp:
+            return ''
+        return settings.OPEN_DATA_URL.rstrip('/') + '/' + self.card_image_webp
+
+    @property
+    def image_srcset(self):
+        """srcset value listing the WebP variants."""
+        storage = self.image_file.storage
+        return ', '.join(f'{storage.url(name)} {width}w' for width, name in self.image_variants)
+
+    @property
+    def image_display_url(self):
+        """Largest variant, falling back to the original until processed."""
+        if self.image_variants:
+            return self.image_file.storage.url(self.image_variants[-1][1])
+        return self.image_file.url if self.image_file else ''
+
+    @property
+    def image_thumbnail_url(self):
+        """Smallest variant, falling back to the original until processed."""
+        if self.image_variants:
+            return self.image_file.storage.url(self.image_variants[0][1])
+        return self.image_file.url if self.image_file else ''
+
     @property
     def has_media(self):
         """Check if complaint has any media attachments."""
         return bool(self.audio_file or self.image_file)
+
+
+class MediaBlob(models.Model):
+    """
+    Reference count for one content-addressed media file.
+
+    Maintained by complaints.storage.ContentAddressedStorage: every save()
+    of identical bytes adds a reference to the same file, and delete()
+    only removes the file when the last reference goes.
+    """
+
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count} refs)'
@@ -0,0 +1,111 @@
+"""
+Content-addressed media storage.
+
+Uploads are streamed to a temporary file while being hashed, then moved
+to <upload dir>/<aa>/<bb>/<sha256>.<ext>. Identical bytes therefore land
+on the same file; the second copy is discarded and a MediaBlob reference
+is added instead. The two-level hash prefix keeps any one directory to
+a few thousand entries.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+# <dir>/<aa>/<bb>/<64 hex>.<ext>
+CONTENT_ADDRESSED_NAME = re.compile(r'(^|/)([0-9a-f]{2})/([0-9a-f]{2})/\2\3[0-9a-f]{60}(\.[\w]+)?$')
+
+INCOMING_DIR = '.incoming'
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_NAME.search(name))
+
+
+def content_addressed_name(directory, digest, extension):
+    return os.path.join(directory, digest[:2], digest[2:4], f'{digest}{extension.lower()}').replace(os.sep, '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by SHA-256 and shares duplicates."""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known once the content is hashed in _save(),
+        # but its length is fixed by the directory and extension
+        directory, basename = os.path.split(name)
+        final_length = len(content_addressed_name(directory, '0' * 64, os.path.splitext(basename)[1]))
+        if max_length is not None and final_length > max_length:
+            raise SuspiciousFileOperation(
+                f'Storage name for "{name}" would be {final_length} characters, '
+                f'more than the field allows ({max_length}).'
+            )
+        return name
+
+    def _save(self, name, content):
+        incoming = self.path(INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            directory, basename = os.path.split(name)
+            final_name = content_addressed_name(directory, digest.hexdigest(), os.path.splitext(basename)[1])
+            final_path = self.path(final_name)
+            if not os.path.exists(final_path):
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                file_move_safe(tmp_path, final_path, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(final_path, self.file_permissions_mode)
+            else:
+                # Refresh the mtime so gc_media's grace period covers the new reference
+                os.utime(final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self.add_reference(final_name, size)
+        return final_name
+
+    def add_reference(self, name, size):
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            blob, created = MediaBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={'size': size, 'ref_count': 1}
+            )
+            if not created:
+                MediaBlob.objects.filter(pk=name).update(ref_count=F('ref_count') + 1)
+
+    def delete(self, name):
+        """Drop one reference; the file goes when nothing refers to it."""
+        if not name:
+            return
+        if not is_content_addressed(name):
+            # Files written before this storage existed are not shared
+            return super().delete(name)
+
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(pk=name).first()
+            if blob is not None and blob.ref_count > 1:
+                MediaBlob.objects.filter(pk=name).update(ref_count=F('ref_count') - 1)
+                return
+            if blob is not None:
+                blob.delete()
+            super().delete(name)
@@ -0,0 +1,133 @@
+"""
+Serving stored media through an access-checked view.
+
+ranged_file_response() answers conditional (ETag) and single-range
+requests for one storage file, so audio players can seek without
+downloading the whole recording:
+
+- with MEDIA_ACCEL_REDIRECT_PREFIX set, nginx is told to send the file
+  itself (X-Accel-Redirect) and handles Range on its own;
+- otherwise the open file is handed to the WSGI server's file wrapper,
+  which gunicorn turns into os.sendfile() for the requested byte span.
+  Nothing is read into Python memory either way.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .storage import is_content_addressed
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+MAX_AGE_SECONDS = 24 * 60 * 60
+
+
+class FileRange:
+    """Read-only view of bytes [start, start + length) of an open file."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def fileno(self):
+        # gunicorn's sendfile() starts at the current offset of this descriptor
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def file_etag(name, stat):
+    """Strong ETag: the SHA-256 in content-addressed names, else mtime and size."""
+    if is_content_addressed(name):
+        return '"%s"' % os.path.splitext(os.path.basename(name))[0]
+    return '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) inclusive for a single-range header, None to send
+    the whole file, or False when the range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        # Multiple ranges or another unit: serving the whole file is allowed
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def ranged_file_response(request, storage, name):
+    """Response for one stored file honouring If-None-Match, If-Range and Range."""
+    path = storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('File not found')
+
+    etag = file_etag(name, stat)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        return not_modified
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(name)
+    else:
+        response = _file_response(request, path, stat.st_size, etag, content_type)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, private=True, max_age=MAX_AGE_SECONDS)
+    return response
+
+
+def _file_response(request, path, size, etag, content_type):
+    byte_range = None
+    header = request.headers.get('Range')
+    # If-Range: only honour Range when the client's copy is still current
+    if header and request.headers.get('If-Range', etag) == etag:
+        byte_range = parse_range(header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    source = open(path, 'rb')
+    if byte_range is None:
+        return FileResponse(source, content_type=content_type)
+
+    start, end = byte_range
+    response = FileResponse(FileRange(source, start, end - start + 1), status=206, content_type=content_type)
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
@@ -0,0 +1,38 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from complaints.fragments import get_or_render
+
+register = template.Library()
+
+
+class ComplaintFragmentNode(template.Node):
+    def __init__(self, nodelist, complaint, variant):
+        self.nodelist = nodelist
+        self.complaint = complaint
+        self.variant = variant
+
+    def render(self, context):
+        complaint = self.complaint.resolve(context)
+        variant = self.variant.resolve(context)
+        return mark_safe(get_or_render(complaint, variant, lambda: self.nodelist.render(context)))
+
+
+@register.tag('complaint_fragment')
+def do_complaint_fragment(parser, token):
+    """
+    Cache the enclosed markup per complaint version and variant.
+
+    Usage::
+
+        {% load complaint_fragments %}
+        {% complaint_fragment complaint 'card' %}
+            .. markup that depends only on the complaint ..
+        {% endcomplaint_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a complaint and a variant name.")
+    nodelist = parser.parse(('endcomplaint_fragment',))
+    parser.delete_first_token()
+    return ComplaintFragmentNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
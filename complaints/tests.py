@@ -0,0 +1,188 @@
+import io
+import os
+import shutil
+import struct
+import tempfile
+import wave
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .forms import ComplaintForm
+from .media_probe import ProbeError, probe_audio
+from .models import Complaint
+from .uploads import load_upload, partial_path
+
+
+def wav_bytes(seconds=1, rate=8000):
+    """A short silent mono WAV recording."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as recording:
+        recording.setnchannels(1)
+        recording.setsampwidth(2)
+        recording.setframerate(rate)
+        recording.writeframes(b'\0\0' * rate * seconds)
+    return buffer.getvalue()
+
+
+def webm_bytes(info, clusters=b''):
+    """EBML header, a Segment of unknown size and an Info element holding info."""
+    doctype = b'\x42\x82\x84webm'
+    header = b'\x1a\x45\xdf\xa3' + bytes([0x80 | len(doctype)]) + doctype
+    segment = b'\x18\x53\x80\x67' + b'\x01\xff\xff\xff\xff\xff\xff\xff'
+    return header + segment + b'\x15\x49\xa9\x66' + bytes([0x80 | len(info)]) + info + clusters
+
+
+def webm_cluster(timecode, block_times, frame=b'\xfc' * 40):
+    """A MediaRecorder-style Cluster of unknown size with SimpleBlocks at block_times (ms)."""
+    cluster = b'\x1f\x43\xb6\x75' + b'\x01\xff\xff\xff\xff\xff\xff\xff'
+    cluster += b'\xe7\x84' + struct.pack('>I', timecode)
+    for block_time in block_times:
+        block = b'\x81' + struct.pack('>h', block_time) + b'\x80' + frame
+        cluster += b'\xa3' + bytes([0x80 | len(block)]) + block
+    return cluster
+
+
+class BrokenInput:
+    """wsgi.input that delivers some bytes, then loses the connection."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def read(self, size=-1):
+        chunk = self.data.read(size)
+        if not chunk:
+            raise ConnectionResetError('client went away')
+        return chunk
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+class ResumableUploadTests(TestCase):
+    """Chunked audio uploads that survive dropped connections."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, OPENAI_API_KEY='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Upload throttle history lives in the cache
+        cache.clear()
+
+        self.audio = wav_bytes()
+        response = self.client.post(
+            reverse('complaints:upload_create'),
+            {'length': len(self.audio), 'filename': 'voice-note.wav'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.token = response.json()['token']
+        self.url = reverse('complaints:upload', args=[self.token])
+
+    def patch(self, offset, data, **extra):
+        return self.client.generic(
+            'PATCH', self.url, data,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+            **extra,
+        )
+
+    def offset(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return int(response['Upload-Offset'])
+
+    def test_interrupted_chunk_keeps_received_bytes(self):
+        received = 3000
+        chunk = self.audio[:8000]
+        response = self.patch(0, b'', **{
+            'wsgi.input': BrokenInput(chunk[:received]),
+            'CONTENT_LENGTH': str(len(chunk)),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(int(response['Upload-Offset']), received)
+        self.assertEqual(self.offset(), received)
+
+    def test_stale_offset_is_rejected_with_current_offset(self):
+        self.assertEqual(self.patch(0, self.audio[:4000]).status_code, 200)
+
+        # A retry of the chunk that already arrived
+        response = self.patch(0, self.audio[:4000])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(int(response['Upload-Offset']), 4000)
+        self.assertEqual(response.json()['offset'], 4000)
+        self.assertEqual(self.offset(), 4000)
+
+    def test_resume_to_completion_and_submit(self):
+        self.patch(0, b'', **{
+            'wsgi.input': BrokenInput(self.audio[:5000]),
+            'CONTENT_LENGTH': str(len(self.audio)),
+        })
+
+        offset = self.offset()
+        response = self.patch(offset, self.audio[offset:])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['complete'])
+
+        response = self.client.post(reverse('complaints:submit_anonymous'), {
+            'raw_text': 'The clinic was closed during working hours.',
+            'category': 'delay',
+            'urgency': 'medium',
+            'county': 'nairobi',
+            'audio_upload': self.token,
+        })
+
+        self.assertEqual(response.status_code, 302)
+        complaint = Complaint.objects.get()
+        with complaint.audio_file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.audio)
+        self.assertTrue(complaint.audio_file.name.endswith('.wav'))
+        self.assertFalse(os.path.exists(partial_path(load_upload(self.token))))
+
+
+class MediaProbeTests(TestCase):
+    """Container headers come from the uploader and must not be trusted."""
+
+    def probe_file(self, data):
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            return probe_audio(f)
+
+    def test_webm_duration(self):
+        # TimecodeScale 1 ms, Duration 12500.0 as a 4-byte float
+        info = b'\x2a\xd7\xb1\x83\x0f\x42\x40' + b'\x44\x89\x84' + struct.pack('>f', 12500.0)
+        self.assertEqual(self.probe_file(webm_bytes(info)).duration, 12.5)
+
+    def test_webm_oversized_duration_is_rejected(self):
+        # A Duration element claiming 2**45 bytes, in an 8-byte size
+        info = b'\x44\x89' + b'\x01' + (2 ** 45).to_bytes(7, 'big') + b'\0' * 8
+        with self.assertRaises(ProbeError):
+            self.probe_file(webm_bytes(info))
+
+    def test_webm_duration_of_wrong_size_is_rejected(self):
+        info = b'\x44\x89\x82\0\0'
+        with self.assertRaises(ProbeError):
+            self.probe_file(webm_bytes(info))
+
+    def test_webm_without_duration_is_estimated_from_last_cluster(self):
+        # MediaRecorder output: Info has no Duration, Clusters have unknown size
+        info = b'\x2a\xd7\xb1\x83\x0f\x42\x40'
+        clusters = b''.join(
+            webm_cluster(start, range(0, 5000, 20)) for start in range(0, 95000, 5000)
+        )
+        duration = self.probe_file(webm_bytes(info, clusters)).duration
+        self.assertAlmostEqual(duration, 94.98)
+
+    def test_long_webm_recording_is_rejected(self):
+        clusters = b''.join(webm_cluster(start, range(0, 5000, 500)) for start in range(0, 95000, 5000))
+        audio = SimpleUploadedFile('note.webm', webm_bytes(b'', clusters), content_type='audio/webm')
+        form = ComplaintForm()
+        with self.assertRaisesMessage(ValidationError, 'at most'):
+            form._check_audio(audio)
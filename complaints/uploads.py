@@ -0,0 +1,155 @@
+"""
+Resumable chunked uploads for audio recordings.
+
+A client on a flaky connection creates an upload (declaring its length),
+then PATCHes chunks at the offset the server reports. Each chunk is
+streamed from the request straight into a partial file under
+MEDIA_ROOT/.incoming, so nothing is buffered in worker memory and a
+dropped connection keeps every byte that arrived: the client asks for the
+offset again and carries on from there.
+
+The upload id is a signed token carrying the declared length and file
+name, so no table is needed; the partial file is the only state. The
+complaint form takes the token of a completed upload in place of a file
+(see ComplaintForm.clean). Abandoned partial files are removed by
+gc_media once they are past its grace period.
+"""
+import fcntl
+import os
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import UnreadablePostError
+from django.utils.text import get_valid_filename
+from rest_framework.throttling import SimpleRateThrottle
+
+from .storage import INCOMING_DIR
+
+UPLOAD_SALT = 'complaints.upload'
+
+# Same limit as ComplaintForm.clean_audio_file
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# Read size when copying a chunk from the request to disk
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """The upload or chunk is invalid."""
+
+
+class UploadConflict(Exception):
+    """The chunk does not start at the current offset (or another write is in progress)."""
+
+    def __init__(self, offset):
+        super().__init__(f'Upload is at offset {offset}')
+        self.offset = offset
+
+
+class UploadRateThrottle(SimpleRateThrottle):
+    """
+    Limit new uploads per account, or per IP for anonymous clients (the
+    'upload' rate), so nobody can fill .incoming with partial files
+    faster than gc_media removes them.
+    """
+    scope = 'upload'
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+def create_upload(length, filename):
+    """Start an upload of length bytes and return its token."""
+    if length <= 0 or length > MAX_UPLOAD_BYTES:
+        raise UploadError('Audio file must be less than 10MB.')
+    try:
+        name = get_valid_filename(os.path.basename(filename))
+    except SuspiciousFileOperation:
+        name = 'recording'
+    return signing.dumps({'id': uuid.uuid4().hex, 'length': length, 'name': name}, salt=UPLOAD_SALT)
+
+
+def load_upload(token):
+    """Return the upload for a token; raises signing.BadSignature when invalid or expired."""
+    return signing.loads(token, salt=UPLOAD_SALT, max_age=settings.UPLOAD_MAX_AGE_SECONDS)
+
+
+def partial_path(upload):
+    return default_storage.path(f"{INCOMING_DIR}/upload-{upload['id']}.part")
+
+
+def upload_offset(upload):
+    """Bytes received so far."""
+    try:
+        return os.path.getsize(partial_path(upload))
+    except FileNotFoundError:
+        return 0
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Copy length bytes from stream onto the upload at offset and return the
+    new offset. If the stream breaks off, the bytes already written are
+    kept and the shorter offset is returned.
+    """
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as part:
+        try:
+            # Two requests for the same upload (e.g. a retry racing the original)
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict(os.path.getsize(path))
+
+        current = part.seek(0, os.SEEK_END)
+        if offset != current:
+            raise UploadConflict(current)
+        if current + length > upload['length']:
+            raise UploadError('Chunk runs past the declared upload length.')
+
+        remaining = length
+        try:
+            while remaining:
+                data = stream.read(min(remaining, COPY_BLOCK_SIZE))
+                if not data:
+                    break
+                part.write(data)
+                remaining -= len(data)
+        except UnreadablePostError:
+            # Client went away mid-chunk; keep what arrived
+            pass
+        part.flush()
+        return part.tell()
+
+
+def open_completed(token):
+    """File for a fully received upload, for assigning to Complaint.audio_file."""
+    try:
+        upload = load_upload(token)
+    except signing.BadSignature:
+        raise UploadError('The audio upload has expired. Please upload it again.')
+    if upload_offset(upload) != upload['length']:
+        raise UploadError('The audio upload is not complete. Please upload it again.')
+    return File(open(partial_path(upload), 'rb'), name=upload['name'])
+
+
+def discard_upload(token):
+    """Delete the partial file once its contents are in storage."""
+    if not token:
+        return
+    try:
+        upload = load_upload(token)
+    except signing.BadSignature:
+        return
+    try:
+        os.remove(partial_path(upload))
+    except FileNotFoundError:
+        pass
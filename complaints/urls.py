@@ -6,7 +6,10 @@ app_name = 'complaints'
 urlpatterns = [
     path('submit/', views.ComplaintCreateView.as_view(), name='submit'),
     path('submit/anonymous/', views.AnonymousComplaintCreateView.as_view(), name='submit_anonymous'),
-    path('success/', views.complaint_success, name='success'),
+    path('success/<str:token>/', views.complaint_success, name='success'),
+    path('uploads/', views.upload_create, name='upload_create'),
+    path('uploads/<str:token>/', views.upload_detail, name='upload'),
     path('<uuid:pk>/', views.ComplaintDetailView.as_view(), name='detail'),
     path('<uuid:pk>/card/', views.complaint_card, name='card'),
+    path('<uuid:pk>/audio/', views.complaint_audio, name='audio'),
 ]
@@ -1,23 +1,38 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import CreateView, DetailView
-from django.urls import reverse_lazy
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.db import transaction
+from accounts.counters import adjust_user_counters, complaint_counters
+from .cards import schedule_card_render
+from .images import schedule_image_processing
 from .models import Complaint
+from .streaming import ranged_file_response
+from .uploads import (
+    UploadConflict, UploadError, UploadRateThrottle, append_chunk, create_upload, discard_upload, load_upload,
+    upload_offset,
+)
 from .forms import ComplaintForm
 from ai_services.openai_service import OpenAIService
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+SUCCESS_LINK_SALT = 'complaints.success'
+
 
 class AnonymousComplaintCreateView(CreateView):
     """View for anonymous complaint submission. No login required."""
     model = Complaint
     form_class = ComplaintForm
     template_name = 'complaints/submit_anonymous.html'
-    success_url = reverse_lazy('complaints:success')
 
     def form_valid(self, form):
         # Force anonymous submission
@@ -25,15 +40,17 @@ class AnonymousComplaintCreateView(CreateView):
         complaint.is_anonymous = True
         complaint.user = None
         complaint.save()
+        discard_upload(form.cleaned_data.get('audio_upload'))
         self.object = complaint
 
         # Process complaint with AI
         self._process_complaint_with_ai(complaint)
 
-        # Store complaint ID in session for success page
-        self.request.session['last_complaint_id'] = str(complaint.id)
+        # Strip metadata and build variants once the request is done with the row
+        schedule_image_processing(complaint)
 
-        return redirect(self.success_url)
+        # The success page gets the complaint from a signed link, not the session
+        return redirect(success_url(complaint))
 
     def _process_complaint_with_ai(self, complaint):
         """Process complaint using OpenAI services."""
@@ -87,6 +104,8 @@ class AnonymousComplaintCreateView(CreateView):
 
             # Save the updated complaint
             complaint.save()
+            if complaint.ai_processed:
+                schedule_card_render(complaint.pk)
 
         except Exception as e:
             logger.error(f"AI processing failed for complaint {complaint.id}: {str(e)}")
@@ -100,7 +119,6 @@ class ComplaintCreateView(LoginRequiredMixin, CreateView):
     model = Complaint
     form_class = ComplaintForm
     template_name = 'complaints/submit.html'
-    success_url = reverse_lazy('complaints:success')
     login_url = 'accounts:login'
 
     def form_valid(self, form):
@@ -115,25 +133,31 @@ class ComplaintCreateView(LoginRequiredMixin, CreateView):
             complaint.is_anonymous = False
             complaint.user = self.request.user
         
-        complaint.save()
+        # Save the complaint and bump the user's counters in one transaction.
+        # Accountability points are only awarded for non-anonymous reports.
+        with transaction.atomic():
+            complaint.save()
+            if not complaint.is_anonymous:
+                adjust_user_counters(
+                    complaint.user_id,
+                    accountability_points=1,
+                    **complaint_counters(complaint),
+                )
+        discard_upload(form.cleaned_data.get('audio_upload'))
         self.object = complaint
 
         # Process complaint with AI
         self._process_complaint_with_ai(complaint)
 
-        # Store complaint ID in session for success page
-        self.request.session['last_complaint_id'] = str(complaint.id)
-
-        # Add accountability point to user's account (only for non-anonymous)
-        if not complaint.is_anonymous:
-            user = self.request.user
-            user.accountability_points += 1
-            user.save()
+        # Strip metadata and build variants once the request is done with the row
+        schedule_image_processing(complaint)
 
-        return redirect(self.success_url)
+        # The success page gets the complaint from a signed link, not the session
+        return redirect(success_url(complaint))
 
     def _process_complaint_with_ai(self, complaint):
         """Process complaint using OpenAI services."""
+        was_processed = complaint.ai_processed
         try:
             ai_service = OpenAIService()
 
@@ -183,13 +207,24 @@ class ComplaintCreateView(LoginRequiredMixin, CreateView):
                     complaint.ai_processed = False
 
             # Save the updated complaint
-            complaint.save()
+            self._save_processed(complaint, was_processed)
 
         except Exception as e:
             logger.error(f"AI processing failed for complaint {complaint.id}: {str(e)}")
             # Don't fail the submission if AI processing fails
             complaint.ai_processed = False
+            self._save_processed(complaint, was_processed)
+
+    def _save_processed(self, complaint, was_processed):
+        """Save processing results and move the owner's pending counter."""
+        with transaction.atomic():
             complaint.save()
+            adjust_user_counters(
+                complaint.user_id,
+                pending_complaints_count=int(was_processed) - int(complaint.ai_processed),
+            )
+            if complaint.ai_processed:
+                schedule_card_render(complaint.pk)
 
 
 class ComplaintDetailView(DetailView):
@@ -202,11 +237,35 @@ class ComplaintDetailView(DetailView):
             return ['complaints/detail_dashboard.html']
         return ['complaints/detail.html']
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['og_image_url'] = _og_image_url(self.request, self.object)
+        return context
+
 
-def complaint_success(request):
+def _og_image_url(request, complaint):
+    """Absolute URL of the pre-rendered share image, for og:image."""
+    if not complaint.card_image_url:
+        return ''
+    return request.build_absolute_uri(complaint.card_image_url)
+
+
+def success_url(complaint):
+    """Signed, expiring link to the success page for one complaint."""
+    token = signing.dumps(str(complaint.id), salt=SUCCESS_LINK_SALT)
+    return reverse('complaints:success', args=[token])
+
+
+def complaint_success(request, token):
     """Success page after complaint submission."""
-    complaint_id = request.session.get('last_complaint_id')
     complaint = None
+    try:
+        complaint_id = signing.loads(
+            token, salt=SUCCESS_LINK_SALT, max_age=settings.SUCCESS_LINK_MAX_AGE_SECONDS
+        )
+    except signing.BadSignature:
+        # Expired or tampered link: show the generic thank-you page
+        complaint_id = None
     if complaint_id:
         complaint = Complaint.objects.filter(id=complaint_id).first()
 
@@ -227,5 +286,86 @@ def complaint_card(request, pk):
     complaint = get_object_or_404(Complaint, pk=pk)
     template_name = 'complaints/card_dashboard.html' if request.user.is_authenticated else 'complaints/card.html'
     return render(request, template_name, {
-        'complaint': complaint
+        'complaint': complaint,
+        'og_image_url': _og_image_url(request, complaint),
     })
+
+
+def can_play_audio(user, complaint):
+    """Recordings of anonymous complaints can identify the speaker: admins only."""
+    if user.role == 'admin' or user.is_superuser:
+        return True
+    return not complaint.is_anonymous
+
+
+@login_required
+def complaint_audio(request, pk):
+    """Stream a complaint's audio recording with Range and ETag support."""
+    complaint = get_object_or_404(Complaint.objects.only('id', 'is_anonymous', 'audio_file'), pk=pk)
+    if not complaint.audio_file or not can_play_audio(request.user, complaint):
+        raise Http404('No audio recording')
+    return ranged_file_response(request, complaint.audio_file.storage, complaint.audio_file.name)
+
+
+def _upload_response(token, upload, offset, status=200):
+    response = JsonResponse({
+        'token': token,
+        'offset': offset,
+        'length': upload['length'],
+        'complete': offset == upload['length'],
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+    }, status=status)
+    response['Upload-Offset'] = offset
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@require_POST
+def upload_create(request):
+    """Start a resumable audio upload. Body: {"length": bytes, "filename": name}."""
+    throttle = UploadRateThrottle()
+    if not throttle.allow_request(request, None):
+        response = JsonResponse({'error': 'Too many uploads. Please try again later.'}, status=429)
+        response['Retry-After'] = int(throttle.wait() or 1)
+        return response
+    try:
+        payload = json.loads(request.body or b'{}')
+        length = int(payload['length'])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Send the file length as JSON.'}, status=400)
+    try:
+        token = create_upload(length, str(payload.get('filename', '')))
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=413)
+    response = _upload_response(token, load_upload(token), 0, status=201)
+    response['Location'] = reverse('complaints:upload', args=[token])
+    return response
+
+
+@require_http_methods(['GET', 'HEAD', 'PATCH'])
+def upload_detail(request, token):
+    """
+    GET/HEAD: how many bytes of the upload have arrived (Upload-Offset).
+    PATCH: append the request body, which must start at Upload-Offset.
+    """
+    try:
+        upload = load_upload(token)
+    except signing.BadSignature:
+        return JsonResponse({'error': 'Unknown or expired upload.'}, status=404)
+
+    if request.method != 'PATCH':
+        return _upload_response(token, upload, upload_offset(upload))
+
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Upload-Offset and Content-Length are required.'}, status=400)
+    try:
+        # request.read() streams from the socket; request.body would buffer it all
+        offset = append_chunk(upload, offset, request, length)
+    except UploadConflict as e:
+        return _upload_response(token, upload, e.offset, status=409)
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return _upload_response(token, upload, offset)
@@ -0,0 +1,37 @@
+"""
+Small in-process worker for post-request jobs (image processing, share
+cards).
+
+Jobs are submitted after the surrounding transaction commits and run on
+a bounded thread pool, so the response is not held up. They are not
+durable: each caller also has a management command that sweeps up work
+lost to a restart.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.BACKGROUND_WORKERS,
+    thread_name_prefix='background',
+)
+
+
+def _run(func, args):
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Background job %s%r failed', func.__name__, args)
+    finally:
+        close_old_connections()
+
+
+def run_after_commit(func, *args):
+    """Run func(*args) on the background pool once the transaction commits."""
+    transaction.on_commit(lambda: _executor.submit(_run, func, args))
+
@@ -0,0 +1,70 @@
+"""Cache backends that report hit/miss counts to Prometheus, and page caching."""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .metrics import CACHE_REQUESTS
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    """
+    Count get() hits and misses per cache.
+
+    The label comes from the cache's METRICS_NAME setting (default
+    'default'), so several caches can be told apart.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        params = args[1] if len(args) > 1 else kwargs.get('params', {})
+        self.metrics_name = params.get('METRICS_NAME', 'default')
+        self._hits = CACHE_REQUESTS.labels(self.metrics_name, 'hit')
+        self._misses = CACHE_REQUESTS.labels(self.metrics_name, 'miss')
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            self._misses.inc()
+            return default
+        self._hits.inc()
+        return value
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
+
+
+def anonymous_cache_page(timeout):
+    """
+    Cache a view's full response for visitors without a session.
+
+    A request with no session cookie cannot be logged in, so the cached
+    copy is served without loading a session or user. Responses carry
+    Vary: Cookie so shared caches keep logged-in pages separate.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or settings.SESSION_COOKIE_NAME in request.COOKIES):
+                return view_func(request, *args, **kwargs)
+
+            path_hash = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+            key = f'page:{view_func.__module__}.{view_func.__name__}:{path_hash}'
+            response = cache.get(key)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming or response.cookies:
+                    return response
+                patch_vary_headers(response, ('Cookie',))
+                patch_cache_control(response, public=True, max_age=timeout)
+                cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+"""
+Readiness probes for /readyz.
+
+Each worker runs the database, media-storage and AI-provider checks in
+parallel at most once per READINESS_CACHE_SECONDS; probes arriving in
+between get the cached result. Only one thread refreshes at a time, the
+rest keep answering from the previous result.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connection
+
+# One thread per check
+READINESS_THREADS = 3
+
+_executor = ThreadPoolExecutor(max_workers=READINESS_THREADS, thread_name_prefix='readyz')
+_refresh_lock = threading.Lock()
+_cached = {'checked_at': 0.0, 'result': None}
+
+
+def check_database():
+    # Runs on a pool thread, which keeps its own persistent connection
+    connection.close_if_unusable_or_obsolete()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    return 'ok'
+
+
+def check_media():
+    media_root = str(settings.MEDIA_ROOT)
+    if not os.path.isdir(media_root):
+        os.makedirs(media_root, exist_ok=True)
+    if not os.access(media_root, os.W_OK):
+        raise OSError(f'{media_root} is not writable')
+    return 'ok'
+
+
+def check_ai():
+    """
+    Reachability of the OpenAI API.
+
+    Complaints are stored before AI processing, so this is reported but
+    never makes the service unready.
+    """
+    if not settings.OPENAI_API_KEY:
+        return 'not_configured'
+
+    from openai import OpenAI
+
+    client = OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=settings.READINESS_TIMEOUT_SECONDS,
+        max_retries=0,
+    )
+    client.models.retrieve('whisper-1')
+    return 'ok'
+
+
+CHECKS = {
+    'database': (check_database, True),
+    'media': (check_media, True),
+    'ai': (check_ai, False),
+}
+
+
+def run_checks():
+    """Run every check concurrently and return the combined result."""
+    futures = {name: _executor.submit(check) for name, (check, _) in CHECKS.items()}
+    wait(futures.values(), timeout=settings.READINESS_TIMEOUT_SECONDS)
+
+    checks = {}
+    ready = True
+    for name, future in futures.items():
+        if not future.done():
+            status = 'timeout'
+        elif future.exception() is not None:
+            status = f'error: {future.exception()}'
+        else:
+            status = future.result()
+        checks[name] = status
+        if CHECKS[name][1] and status != 'ok':
+            ready = False
+    return {'status': 'ready' if ready else 'unready', 'checks': checks}
+
+
+def readiness():
+    """Return the cached readiness result, refreshing it when stale."""
+    now = time.monotonic()
+    result = _cached['result']
+    if result is not None and now - _cached['checked_at'] < settings.READINESS_CACHE_SECONDS:
+        return result
+
+    # Another thread is already refreshing: answer with the last result
+    if not _refresh_lock.acquire(blocking=result is None):
+        return result
+    try:
+        if _cached['result'] is result:
+            _cached['result'] = run_checks()
+            _cached['checked_at'] = time.monotonic()
+        return _cached['result']
+    finally:
+        _refresh_lock.release()
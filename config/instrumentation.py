@@ -0,0 +1,111 @@
+"""
+Per-request timing of SQL, template rendering and AI calls.
+
+RequestTimingMiddleware opens a RequestTimings collector for sampled
+requests; the hooks below add to it while it is active and cost a single
+ContextVar lookup otherwise.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.backends.django import DjangoTemplates, Template
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Accumulated durations (seconds) and counts for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.template_time = 0.0
+        self.ai_time = 0.0
+        self.ai_calls = 0
+        self._template_depth = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - t0
+            self.db_queries += 1
+
+
+@contextmanager
+def collect():
+    """Activate a collector for the duration of the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current():
+    """Return the active collector, or None when the request is not sampled."""
+    return _current.get()
+
+
+@contextmanager
+def ai_call(operation):
+    """
+    Time an outbound AI provider call.
+
+    Always feeds the Prometheus latency/error metrics; also adds to the
+    request collector when the current request is sampled.
+    """
+    from .metrics import OPENAI_ERRORS, OPENAI_LATENCY
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        OPENAI_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        OPENAI_LATENCY.labels(operation).observe(elapsed)
+        timings = _current.get()
+        if timings is not None:
+            timings.ai_time += elapsed
+            timings.ai_calls += 1
+
+
+class InstrumentedTemplate(Template):
+    """Template wrapper that adds its render time to the request collector."""
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+
+        # Only the outermost render counts; {% include %} runs inside it
+        timings._template_depth += 1
+        t0 = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings._template_depth -= 1
+            if not timings._template_depth:
+                timings.template_time += time.perf_counter() - t0
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend returning InstrumentedTemplate objects."""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
@@ -0,0 +1,82 @@
+"""
+Prometheus metrics for the /metrics endpoint.
+
+With PROMETHEUS_MULTIPROC_DIR set (see the Dockerfile), every gunicorn
+worker writes its samples to its own mmap-backed file and the endpoint
+merges them at scrape time. Workers never coordinate with each other or
+with the scraper; each one only updates its own file.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+REQUEST_LATENCY = Histogram(
+    'sauti_request_duration_seconds',
+    'Request latency by view',
+    ['view', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'sauti_request_db_queries',
+    'SQL queries executed per request',
+    ['view'],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128),
+)
+OPENAI_LATENCY = Histogram(
+    'sauti_openai_request_duration_seconds',
+    'OpenAI API call latency',
+    ['operation'],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+OPENAI_ERRORS = Counter(
+    'sauti_openai_errors_total',
+    'OpenAI API calls that raised',
+    ['operation'],
+)
+CACHE_REQUESTS = Counter(
+    'sauti_cache_requests_total',
+    'Cache lookups by outcome',
+    ['cache', 'result'],
+)
+
+
+class QueueDepthCollector:
+    """Reports complaints still waiting for AI processing at scrape time."""
+
+    def collect(self):
+        from complaints.models import Complaint
+
+        gauge = GaugeMetricFamily(
+            'sauti_unprocessed_complaints',
+            'Complaints not yet processed by AI',
+        )
+        gauge.add_metric([], Complaint.objects.filter(ai_processed=False).count())
+        yield gauge
+
+
+def status_class(status_code):
+    """Collapse status codes to 2xx/3xx/... to keep label cardinality low."""
+    return f'{status_code // 100}xx'
+
+
+def render_latest():
+    """Return (body, content type) for a scrape, merging all workers."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = CollectorRegistry()
+        for collector in (REQUEST_LATENCY, REQUEST_DB_QUERIES, OPENAI_LATENCY,
+                          OPENAI_ERRORS, CACHE_REQUESTS):
+            registry.register(collector)
+    registry.register(QueueDepthCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
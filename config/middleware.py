@@ -0,0 +1,174 @@
+"""Project-wide middleware."""
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+from urllib.parse import urlparse
+
+from django.conf import settings as django_settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import instrumentation, metrics, routers
+
+timing_logger = logging.getLogger('sauti.request_timing')
+
+# Partition files written by publish_open_data carry a 12-hex content hash
+OPEN_DATA_HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[a-z.]+$')
+
+
+class OpenDataWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also serves the files written by publish_open_data.
+
+    Open-data files appear after workers have started, so that prefix is
+    looked up on disk per request instead of in WhiteNoise's startup index.
+    Content-hashed partitions are cached forever; the manifest uses the
+    normal WhiteNoise max-age. When OPEN_DATA_URL points at a CDN the
+    files are not served locally at all.
+    """
+
+    def __init__(self, get_response=None, settings=django_settings):
+        super().__init__(get_response, settings=settings)
+        open_data_url = settings.OPEN_DATA_URL
+        self.open_data_root = os.path.join(os.path.abspath(settings.OPEN_DATA_ROOT), '')
+        self.open_data_prefix = '/' + open_data_url.strip('/') + '/'
+        self.serve_open_data = not urlparse(open_data_url).netloc
+
+    def __call__(self, request):
+        if self.serve_open_data and request.path_info.startswith(self.open_data_prefix):
+            static_file = self.find_open_data_file(request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+        return super().__call__(request)
+
+    def find_open_data_file(self, url):
+        path = os.path.normpath(os.path.join(self.open_data_root, url[len(self.open_data_prefix):]))
+        if not self.path_is_child_of(path, self.open_data_root) or not os.path.isfile(path):
+            return None
+        return self.get_static_file(path, url)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.open_data_prefix):
+            return bool(OPEN_DATA_HASHED_NAME.search(url))
+        return super().immutable_file_test(path, url)
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes for replica routing (see config.routers).
+
+    Tracks whether the request writes; after a POST (or other unsafe
+    request) that did, a short-lived cookie keeps the client's reads on
+    the primary until the replica has had time to catch up. Removes itself
+    when no replica is configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not routers.replica_configured():
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        pinned = django_settings.REPLICA_PIN_COOKIE_NAME in request.COOKIES
+        with routers.request_routing(pinned) as routing:
+            response = self.get_response(request)
+        # Writes made while serving a GET (stats refreshes, session touches)
+        # are not the client's own; a cookie there would also stop caching
+        if routing.wrote and request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                django_settings.REPLICA_PIN_COOKIE_NAME, '1',
+                max_age=django_settings.REPLICA_PIN_SECONDS,
+                secure=django_settings.SESSION_COOKIE_SECURE,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Measure SQL, template and AI time for a sample of requests.
+
+    Results are returned in a Server-Timing header (visible in browser
+    dev tools) and logged as one JSON line on the sauti.request_timing
+    logger. REQUEST_TIMING_SAMPLE_RATE sets the sampled fraction; at 0
+    the middleware removes itself from the stack at startup.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = django_settings.REQUEST_TIMING_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with instrumentation.collect() as timings, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+            total = timings.total_time
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} queries"',
+            f'tpl;dur={timings.template_time * 1000:.1f}',
+            f'ai;dur={timings.ai_time * 1000:.1f};desc="{timings.ai_calls} calls"',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        timing_logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(timings.db_time * 1000, 2),
+            'db_queries': timings.db_queries,
+            'template_ms': round(timings.template_time * 1000, 2),
+            'ai_ms': round(timings.ai_time * 1000, 2),
+            'ai_calls': timings.ai_calls,
+        }))
+        return response
+
+
+class QueryCounter:
+    """Minimal execute_wrapper that only counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class PrometheusMetricsMiddleware:
+    """Record per-view latency and SQL query count for /metrics."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        t0 = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - t0
+
+        # Unresolved paths share one label so 404 scans can't blow up cardinality
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        metrics.REQUEST_LATENCY.labels(
+            view, request.method, metrics.status_class(response.status_code)
+        ).observe(elapsed)
+        metrics.REQUEST_DB_QUERIES.labels(view).observe(queries.count)
+        return response
@@ -0,0 +1,91 @@
+"""
+Read-replica routing.
+
+Reads go to the `replica` database only inside views marked with
+replica_reads (analytics, exports and public pages, which tolerate a few
+seconds of replication lag); everything else, and every write, uses
+`default`. Once a request writes, its remaining reads go to the primary,
+and ReplicaPinMiddleware keeps that client on the primary for
+REPLICA_PIN_SECONDS so a submitter always sees their own changes. When no
+replica is configured every query goes to `default`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = 'replica'
+
+_current = ContextVar('db_routing', default=None)
+
+
+class RequestRouting:
+    """Routing state for one request."""
+
+    def __init__(self, pinned=False):
+        # Client wrote recently: its replica may not have caught up yet
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = False
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def request_routing(pinned=False):
+    """Track writes (and allow replica reads) for the duration of a request."""
+    routing = RequestRouting(pinned)
+    token = _current.set(routing)
+    try:
+        yield routing
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def use_replica(request):
+    """Send this block's reads to the replica unless the request must see the primary."""
+    routing = _current.get()
+    if routing is None or routing.replica or request.method not in ('GET', 'HEAD'):
+        yield
+        return
+    routing.replica = True
+    try:
+        yield
+    finally:
+        routing.replica = False
+
+
+def replica_reads(view_func):
+    """Let a read-only view be served from the replica."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with use_replica(request):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Database router for the `replica` alias (see module docstring)."""
+
+    def db_for_read(self, model, **hints):
+        routing = _current.get()
+        if (routing is not None and routing.replica and not routing.pinned
+                and not routing.wrote and replica_configured()):
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = _current.get()
+        if routing is not None:
+            routing.wrote = True
+        # Explicit, or a row read from the replica would be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
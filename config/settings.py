@@ -32,6 +32,8 @@ if not DEBUG:
 # Production security settings
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
+    # Platform probes call the container over plain HTTP
+    SECURE_REDIRECT_EXEMPT = [r'^livez$', r'^readyz$']
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     SECURE_BROWSER_XSS_FILTER = True
@@ -52,6 +54,7 @@ INSTALLED_APPS = [
 
     # Third-party apps
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
 
     # Local apps
@@ -61,6 +64,7 @@ INSTALLED_APPS = [
     'pages',
     'citizen',
     'admin_panel',
+    'api',
 ]
 
 # Custom user model
@@ -71,10 +75,30 @@ LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'citizen:dashboard'
 LOGOUT_REDIRECT_URL = 'pages:landing'
 
+# Sessions. SESSION_BACKEND picks the engine:
+#   db             - django_session table (default)
+#   cached_db      - db, with reads served from the cache
+#   cache          - cache only; needs a cache shared by all workers
+#                    (the default LocMem cache is per process)
+#   signed_cookies - no server-side storage at all
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_BACKEND', 'db')]
+
+# Lifetime of the signed link to the post-submission success page
+SUCCESS_LINK_MAX_AGE_SECONDS = 60 * 60
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files
+    'config.middleware.OpenDataWhiteNoiseMiddleware',  # Serve static and open-data files
+    'config.middleware.PrometheusMetricsMiddleware',  # Per-view latency for /metrics
+    'config.middleware.RequestTimingMiddleware',  # Server-Timing for sampled requests
     'corsheaders.middleware.CorsMiddleware',
+    'config.middleware.ReplicaPinMiddleware',  # Read-your-writes with a read replica
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -87,7 +111,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus render timing for RequestTimingMiddleware
+        'BACKEND': 'config.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -104,13 +129,27 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database - PostgreSQL
+# Persistent connections: each request thread keeps its connection open
+# for DB_CONN_MAX_AGE seconds and checks it is alive before reusing it, so
+# requests do not pay for a new connection (and TLS handshake). A worker
+# holds at most one connection per thread; see gunicorn.conf.py for the
+# total. Set DB_PGBOUNCER=true behind pgbouncer in transaction mode, which
+# cannot keep server-side cursors open between transactions.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() in ('true', '1', 'yes')
+# `manage.py boot` holds a session-level advisory lock while it migrates,
+# which a transaction-mode pooler cannot keep on one server connection;
+# with DB_PGBOUNCER set, boot connects straight to Postgres through this URL
+DATABASE_DIRECT_URL = os.getenv('DATABASE_DIRECT_URL', '')
+
 # Support both DATABASE_URL (Railway/Heroku) and individual variables
 if os.getenv('DATABASE_URL'):
     DATABASES = {
         'default': dj_database_url.config(
             default=os.getenv('DATABASE_URL'),
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
             conn_health_checks=True,
+            disable_server_side_cursors=DB_PGBOUNCER,
         )
     }
 else:
@@ -122,9 +161,30 @@ else:
             'PASSWORD': os.getenv('DB_PASSWORD', ''),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
         }
     }
 
+# Optional read replica for analytics and public pages (config/routers.py).
+# Without it every query goes to the primary.
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = dj_database_url.config(
+        env='DATABASE_REPLICA_URL',
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        disable_server_side_cursors=DB_PGBOUNCER,
+        # Tests read and write one database
+        test_options={'MIRROR': 'default'},
+    )
+
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+
+# After a client writes, its reads stay on the primary this long
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '15'))
+REPLICA_PIN_COOKIE_NAME = 'db_pin'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -154,8 +214,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 
 # WhiteNoise configuration for efficient static file serving
 STORAGES = {
+    # Uploads are stored by SHA-256 and de-duplicated (complaints.storage)
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "BACKEND": "complaints.storage.ContentAddressedStorage",
     },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
@@ -165,6 +226,15 @@ STORAGES = {
 # Media files (uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Audio evidence is served by complaints.views.complaint_audio after an
+# access check. Behind nginx, set this to an `internal` location aliased to
+# MEDIA_ROOT (e.g. /protected-media/) to hand the transfer to nginx.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+# Open data files written by `publish_open_data`. Set OPEN_DATA_URL to a CDN
+# base URL to stop serving them through WhiteNoise.
+OPEN_DATA_ROOT = Path(os.getenv('OPEN_DATA_ROOT', BASE_DIR / 'opendata'))
+OPEN_DATA_URL = os.getenv('OPEN_DATA_URL', '/opendata/')
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -197,19 +267,101 @@ if not DEBUG:
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.getenv('API_ANON_THROTTLE_RATE', '60/min'),
+        'user': os.getenv('API_USER_THROTTLE_RATE', '600/min'),
+        'ingest': os.getenv('INGEST_THROTTLE_RATE', '120/min'),
+        # New resumable audio uploads (complaints.uploads.UploadRateThrottle)
+        'upload': os.getenv('UPLOAD_THROTTLE_RATE', '30/hour'),
+    },
 }
 
+# Seconds public API responses are cached
+API_CACHE_SECONDS = int(os.getenv('API_CACHE_SECONDS', '30'))
+
+# Partner bulk ingestion (api/ingest/)
+INGEST_MAX_RECORDS = int(os.getenv('INGEST_MAX_RECORDS', '10000'))
+INGEST_CHUNK_SIZE = 1000
+
 # AI API Keys
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
 
-# File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
+# File upload settings. Multipart files above this spill to a temp file
+# instead of staying in worker memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5 MB (Django's default)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
 
 # Audio file settings
 MAX_AUDIO_DURATION_SECONDS = 60
 ALLOWED_AUDIO_TYPES = ['audio/mpeg', 'audio/wav', 'audio/ogg', 'audio/webm']
 
+# Resumable audio uploads (complaints.uploads): chunk size suggested to
+# clients, and how long an upload token stays usable
+UPLOAD_CHUNK_SIZE = 256 * 1024
+UPLOAD_MAX_AGE_SECONDS = 24 * 60 * 60
+
 # Image file settings
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/webp']
+MAX_IMAGE_PIXELS = 40_000_000  # ~7700x5200; larger headers are rejected unread
+
+# Request instrumentation: fraction of requests (0-1) that get a
+# Server-Timing header and a sauti.request_timing log line. 0 disables it.
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', '0'))
+
+# /readyz re-runs its checks at most this often per worker, and gives
+# each run this long before reporting a check as timed out
+READINESS_CACHE_SECONDS = float(os.getenv('READINESS_CACHE_SECONDS', '5'))
+READINESS_TIMEOUT_SECONDS = float(os.getenv('READINESS_TIMEOUT_SECONDS', '2'))
+
+# Landing/about pages: full-page cache lifetime for visitors without a
+# session, and how stale the public stats snapshot may get before a
+# request rebuilds it (refresh_public_stats normally keeps it fresh)
+PAGE_CACHE_SECONDS = int(os.getenv('PAGE_CACHE_SECONDS', '60'))
+PUBLIC_STATS_CACHE_SECONDS = 60
+PUBLIC_STATS_MAX_AGE_SECONDS = int(os.getenv('PUBLIC_STATS_MAX_AGE_SECONDS', '600'))
+
+# Threads per worker for post-request jobs (config.background)
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', '2'))
+
+# Bounding boxes (px) of the WebP variants generated for evidence images
+IMAGE_VARIANT_WIDTHS = (160, 480, 960, 1600)
+
+# Fonts for Open Graph card images (Pillow's built-in font if missing)
+CARD_FONT_PATH = os.getenv('CARD_FONT_PATH', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
+CARD_FONT_BOLD_PATH = os.getenv('CARD_FONT_BOLD_PATH', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf')
+
+# Rendered complaint card/detail fragments, keyed by complaint version.
+# A cold miss is rendered once; other requests wait up to the lock timeout.
+FRAGMENT_CACHE_SECONDS = int(os.getenv('FRAGMENT_CACHE_SECONDS', '3600'))
+FRAGMENT_LOCK_TIMEOUT_SECONDS = 5
+
+# Prometheus /metrics. When METRICS_TOKEN is set, scrapers must send
+# "Authorization: Bearer <token>".
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Per-process cache; the backend counts hits/misses for /metrics
+CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.InstrumentedLocMemCache',
+        'LOCATION': 'sauti-default',
+        'METRICS_NAME': 'default',
+    },
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'sauti.request_timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
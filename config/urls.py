@@ -5,7 +5,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 
 
 def health_check(request):
@@ -30,8 +31,37 @@ def health_check(request):
 
     return JsonResponse(status_data)
 
+
+def livez(request):
+    """Liveness probe: the worker is up and serving. No I/O."""
+    return HttpResponse('ok', content_type='text/plain')
+
+
+def readyz(request):
+    """Readiness probe: database, media storage and AI provider (cached)."""
+    from config.health import readiness
+
+    result = readiness()
+    return JsonResponse(result, status=200 if result['status'] == 'ready' else 503)
+
+
+def metrics(request):
+    """Prometheus scrape endpoint (merged across gunicorn workers)."""
+    from config.metrics import render_latest
+
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not constant_time_compare(supplied, settings.METRICS_TOKEN):
+            return HttpResponse(status=401)
+
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
+
 urlpatterns = [
     path('health/', health_check, name='health_check'),  # Health check for Railway
+    path('livez', livez, name='livez'),  # Liveness probe
+    path('readyz', readyz, name='readyz'),  # Readiness probe (cached checks)
+    path('metrics', metrics, name='metrics'),  # Prometheus scrape endpoint
     path('admin/', admin.site.urls),
     path('', include('pages.urls')),  # Landing, about, contact pages
     path('dashboard/', include('dashboard.urls')),  # Public analytics dashboard
@@ -39,6 +69,7 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),  # Auth (login, register, profile)
     path('citizen/', include('citizen.urls')),  # Citizen dashboard
     path('admin-panel/', include('admin_panel.urls')),  # Admin panel dashboard
+    path('api/', include('api.urls')),  # REST API (partner ingestion)
 ]
 
 # Serve media files in development
@@ -0,0 +1,98 @@
+"""
+Start-up warm-up for server processes (see gunicorn.conf.py).
+
+Importing the URLconf (and with it every view) and loading templates
+before the workers fork means every worker inherits them instead of
+paying for them on its first requests;
+opening the database connections in each worker's request threads moves
+the connect (and TLS handshake) off the first requests they serve.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import wait
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def project_templates():
+    """Names of the .html templates in this project's template directories."""
+    base_dir = str(settings.BASE_DIR)
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            directory = str(directory)
+            # Third-party templates (admin, DRF) are left to load on demand
+            if not directory.startswith(base_dir) or 'site-packages' in directory:
+                continue
+            for root, _dirs, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith('.html'):
+                        yield engine, os.path.relpath(os.path.join(root, filename), directory)
+
+
+def warm_templates():
+    """Compile project templates into the cached loader; returns the count."""
+    started = time.perf_counter()
+    count = 0
+    for engine, name in project_templates():
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.warning('Template %s failed to compile during warm-up', name, exc_info=True)
+            continue
+        count += 1
+    logger.info('Warmed %d templates in %.0f ms', count, (time.perf_counter() - started) * 1000)
+    return count
+
+
+def warm_urls():
+    """Import the URLconf, and so every view module."""
+    get_resolver().url_patterns
+
+
+def warm_database():
+    """Open (and check) this thread's connection to each database."""
+    for alias in connections:
+        try:
+            connections[alias].ensure_connection()
+        except Exception:
+            # The worker still starts; readiness reports the outage
+            logger.warning('Could not connect to database %r during warm-up', alias, exc_info=True)
+
+
+def warm_thread_pool(executor, size, timeout=10):
+    """Run warm_database() once in each of the executor's size threads."""
+    # Every task waits for the others, so no thread can pick up two of them
+    barrier = threading.Barrier(size, timeout=timeout)
+
+    def warm():
+        warm_database()
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+    wait([executor.submit(warm) for _ in range(size)], timeout=timeout * 2)
+
+
+def connections_per_worker(threads):
+    """
+    Most connections one worker can hold to each database: Django keeps
+    one per thread that queries, i.e. the request threads, the background
+    pool and the readiness-check pool.
+    """
+    from config.health import READINESS_THREADS
+
+    return threads + settings.BACKGROUND_WORKERS + READINESS_THREADS
+
+
+def close_database():
+    """Drop connections that must not be shared with forked children."""
+    for connection in connections.all(initialized_only=True):
+        connection.close()
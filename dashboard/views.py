@@ -5,9 +5,11 @@ from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta
 from complaints.models import Complaint
+from config.routers import replica_reads
 
 
 @login_required(login_url='accounts:login')
+@replica_reads
 def dashboard_home(request):
     """Main dashboard view with live feed and analytics."""
     # Get filter parameters
@@ -97,6 +99,7 @@ def dashboard_home(request):
     return render(request, 'dashboard/home.html', context)
 
 
+@replica_reads
 def analytics_api(request):
     """API endpoint for dashboard charts (JSON response)."""
     from django.http import JsonResponse
@@ -0,0 +1,145 @@
+"""
+Gunicorn configuration (loaded automatically from the working directory).
+
+    gunicorn config.wsgi:application
+
+Workers and threads are sized from the CPUs and memory the container is
+actually allowed to use (cgroup limits, not the host's), the Django app
+is imported once in the master and shared copy-on-write with the
+workers, and workers are recycled after a jittered number of requests
+so slow memory growth never builds up. Every value can be overridden
+with the environment variables below.
+"""
+import gc
+import math
+import os
+
+# Rough resident size of one worker once warmed up
+WORKER_MEMORY_MB = int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '160'))
+# Share of the memory limit workers may use; the rest is master, page cache and spikes
+MEMORY_HEADROOM = 0.75
+# Connection budget this instance may use on the database (0: not checked)
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '0'))
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    """CPUs usable by this process: affinity mask, capped by a cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _read('/sys/fs/cgroup/cpu.max')  # cgroup v2: "<quota> <period>" or "max <period>"
+    if quota and not quota.startswith('max'):
+        limit, period = (int(value) for value in quota.split())
+        cpus = min(cpus, math.ceil(limit / period))
+    else:
+        limit, period = _read('/sys/fs/cgroup/cpu/cpu.cfs_quota_us'), _read('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, math.ceil(int(limit) / int(period)))
+    return max(cpus, 1)
+
+
+def available_memory_mb():
+    """Memory limit of the container, or the machine's total memory."""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        limit = _read(path)
+        # cgroup v1 reports "no limit" as a huge number
+        if limit and limit.isdigit() and int(limit) < 1 << 60:
+            return int(limit) // (1024 * 1024)
+    meminfo = _read('/proc/meminfo') or ''
+    for line in meminfo.splitlines():
+        if line.startswith('MemTotal:'):
+            return int(line.split()[1]) // 1024
+    return 1024
+
+
+def default_workers():
+    by_cpu = 2 * available_cpus() + 1
+    by_memory = int(available_memory_mb() * MEMORY_HEADROOM // WORKER_MEMORY_MB)
+    return max(1, min(by_cpu, by_memory))
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Threads keep a worker busy while a request waits on OpenAI or the database
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', default_workers()))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+preload_app = True
+
+# Recycle each worker after 1000-1500 requests. Load is spread evenly, so
+# a narrow jitter would restart every worker in the same second.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', str(max_requests // 2)))
+
+# Synchronous AI calls on submission can take a while
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+# No keep-alive: a recycled gthread worker leaves idle kept-alive connections
+# hanging until keepalive expires, stalling whatever request arrives on them.
+# The platform proxy reconnects cheaply.
+keepalive = 0
+
+# Heartbeat files on tmpfs: a slow container disk cannot stall workers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    """Master, after the app is preloaded: load views and templates once for all workers."""
+    from config.warmup import close_database, connections_per_worker, warm_templates, warm_urls
+
+    warm_urls()
+    count = warm_templates()
+    # Connections opened while loading must not be inherited by workers
+    close_database()
+    # Keep the garbage collector from writing to (and so un-sharing) every
+    # object the workers inherit
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        'Serving with %s workers x %s threads (%s CPUs, %s MB); %s templates preloaded',
+        workers, threads, available_cpus(), available_memory_mb(), count,
+    )
+
+    per_worker = connections_per_worker(threads)
+    total = workers * per_worker
+    server.log.info('Up to %s database connections (%s per worker)', total, per_worker)
+    if DB_MAX_CONNECTIONS and total > DB_MAX_CONNECTIONS:
+        server.log.warning(
+            'Workers may open %s connections but DB_MAX_CONNECTIONS is %s; '
+            'lower WEB_CONCURRENCY or GUNICORN_THREADS, or put pgbouncer in front',
+            total, DB_MAX_CONNECTIONS,
+        )
+
+
+def post_worker_init(worker):
+    """Worker: open a database connection in every request thread up front."""
+    from config.warmup import warm_database, warm_thread_pool
+
+    # gthread serves requests from worker.tpool, and connections are per thread
+    pool = getattr(worker, 'tpool', None)
+    if pool is None:
+        warm_database()
+    else:
+        warm_thread_pool(pool, worker.cfg.threads)
+
+
+def child_exit(server, worker):
+    """Let Prometheus drop the exited worker's live gauges."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,184 @@
+"""
+Management command to prepare the database when a container starts.
+Usage: python manage.py boot
+
+Replaces running migrate, create_admin and seed_data on every start. One
+query checks whether every migration is applied, whether the admin
+account exists and whether there are any complaints; steps that are
+already satisfied are skipped, so a restart of an up-to-date deployment
+costs a single round trip. When something does need doing, replicas
+starting together take a Postgres advisory lock so only one of them
+migrates, and the others re-check once it is done.
+
+The lock lives in the database session, so boot must not go through a
+transaction-mode pooler, which can run the unlock on another server
+connection and leave the lock held for good. With DB_PGBOUNCER set, boot
+connects straight to Postgres through DATABASE_DIRECT_URL instead.
+
+Reports the steps it skipped and an estimate of the time saved against
+the old chain: the start-up of the two extra manage.py processes, timed
+from this one's own start-up. The skipped steps' no-op work comes on
+top; benchmarks/boot.py measures the whole difference.
+"""
+import os
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+
+import dj_database_url
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from django.db.migrations.loader import MigrationLoader
+
+from complaints.models import Complaint
+
+# Any 64-bit key; shared by every replica of this app
+BOOT_LOCK_ID = zlib.crc32(b'sauti.boot')
+
+# The old chain ran migrate, create_admin and seed_data as separate processes
+OLD_CHAIN_PROCESSES = 3
+
+
+def seeding_enabled():
+    # Same switch as seed_data
+    return os.getenv('SEED_DATA', '').lower() in ('true', '1', 'yes')
+
+
+def admin_username():
+    # Same default as create_admin
+    return os.getenv('ADMIN_USERNAME', 'admin')
+
+
+def process_age():
+    """Seconds since this process started (Linux), or None."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22, counted after the parenthesised command name
+            started_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return uptime - started_ticks / os.sysconf('SC_CLK_TCK')
+
+
+def use_direct_connection():
+    """Point this process's default connection past pgbouncer at Postgres itself."""
+    if not settings.DATABASE_DIRECT_URL:
+        raise CommandError(
+            'DB_PGBOUNCER is set: boot needs DATABASE_DIRECT_URL, a connection that '
+            'does not go through the pooler, to hold its advisory lock'
+        )
+    connection.close()
+    connection.settings_dict.update(dj_database_url.parse(settings.DATABASE_DIRECT_URL))
+
+
+@contextmanager
+def advisory_lock(key):
+    """Session-level Postgres advisory lock, held for the with block."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', [key])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
+
+
+class Command(BaseCommand):
+    help = 'Migrate, create the admin and seed only if needed, under an advisory lock'
+
+    def handle(self, *args, **options):
+        # Interpreter and Django start-up, which every manage.py process pays
+        startup = process_age()
+        started = time.perf_counter()
+        if settings.DB_PGBOUNCER:
+            use_direct_connection()
+        # Read from disk; no database access
+        leaves = MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes()
+
+        state = self.boot_state(leaves)
+        if self.pending(state):
+            with self.boot_lock():
+                # Another replica may have done the work while we waited
+                state = self.boot_state(leaves)
+                skipped = self.run_steps(state)
+        else:
+            skipped = ['migrate', 'create_admin', 'seed_data']
+            self.stdout.write('Database is ready')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Skipped: {', '.join(skipped) or 'nothing'}")
+        if startup is not None:
+            saved = (OLD_CHAIN_PROCESSES - 1) * startup
+            self.stdout.write(
+                f'Saved about {saved * 1000:.0f} ms: {OLD_CHAIN_PROCESSES - 1} fewer manage.py '
+                f'processes at {startup * 1000:.0f} ms start-up each, plus the '
+                f'skipped steps\' own work (benchmarks/boot.py measures it)'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Boot finished in {elapsed * 1000:.0f} ms'))
+
+    def boot_state(self, leaves):
+        """(migrated, admin exists, has complaints) in one query."""
+        user_table = connection.ops.quote_name(get_user_model()._meta.db_table)
+        complaint_table = connection.ops.quote_name(Complaint._meta.db_table)
+        # Every app's latest migration applied means the whole graph is
+        leaf_match = ' OR '.join(['(app = %s AND name = %s)'] * len(leaves)) or '1 = 0'
+        sql = (
+            f'SELECT (SELECT COUNT(*) FROM django_migrations WHERE {leaf_match}), '
+            f'EXISTS (SELECT 1 FROM {user_table} WHERE username = %s), '
+            f'EXISTS (SELECT 1 FROM {complaint_table})'
+        )
+        params = [part for leaf in leaves for part in leaf] + [admin_username()]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                applied, admin_exists, has_complaints = cursor.fetchone()
+        except DatabaseError:
+            # Fresh database: the tables do not exist yet
+            return {'migrated': False, 'admin': False, 'complaints': False}
+        return {
+            'migrated': applied == len(leaves),
+            'admin': bool(admin_exists),
+            'complaints': bool(has_complaints),
+        }
+
+    def pending(self, state):
+        return (
+            not state['migrated']
+            or not state['admin']
+            or (seeding_enabled() and not state['complaints'])
+        )
+
+    def run_steps(self, state):
+        """Run the steps that are still needed; returns the names of the others."""
+        skipped = []
+        if state['migrated']:
+            skipped.append('migrate')
+            self.stdout.write('Skipped migrate: every migration is applied')
+        else:
+            call_command('migrate', interactive=False, verbosity=1)
+
+        if state['admin']:
+            skipped.append('create_admin')
+            self.stdout.write(f'Skipped create_admin: "{admin_username()}" exists')
+        else:
+            call_command('create_admin')
+
+        if not seeding_enabled():
+            skipped.append('seed_data')
+            self.stdout.write('Skipped seed_data: SEED_DATA not enabled')
+        elif state['complaints']:
+            # seed_data adds its sample complaints again on every run
+            skipped.append('seed_data')
+            self.stdout.write('Skipped seed_data: the database already has complaints')
+        else:
+            call_command('seed_data')
+        return skipped
+
+    def boot_lock(self):
+        # SQLite and other local databases are booted by a single process
+        return advisory_lock(BOOT_LOCK_ID) if connection.vendor == 'postgresql' else nullcontext()
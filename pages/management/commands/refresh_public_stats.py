@@ -0,0 +1,20 @@
+"""
+Management command to rebuild the landing/about page stats snapshot.
+Usage: python manage.py refresh_public_stats
+
+Meant to run on a schedule (e.g. every few minutes from cron).
+"""
+from django.core.management.base import BaseCommand
+
+from pages.stats import refresh_public_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the public stats shown on the landing and about pages'
+
+    def handle(self, *args, **options):
+        stats = refresh_public_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Public stats refreshed: {stats.total_complaints} complaints, '
+            f'{stats.resolved_complaints} resolved, {stats.counties_covered} counties'
+        ))
@@ -0,0 +1,150 @@
+"""
+Management command to measure how long a fresh server process takes to start.
+Usage: python manage.py startup_profile [--path /] [--top 20] [--by package|module] [--runs 3]
+
+Starts a new interpreter with `-X importtime`, loads the WSGI application
+the way gunicorn does, and sends it two requests in-process. Reports the
+time to load the app, to answer the first request (which imports the
+URLconf and views) and the warm second request, followed by the slowest
+imports. Import times are self times, so the rows add up to the total.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in the child process; prints one JSON line with its timings
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+loaded = time.perf_counter()
+
+from wsgiref.util import setup_testing_defaults
+from django.conf import settings
+hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+
+def request():
+    environ = {'PATH_INFO': sys.argv[1], 'HTTP_HOST': hosts[0] if hosts else 'localhost'}
+    setup_testing_defaults(environ)
+    # Served over HTTPS as far as SECURE_SSL_REDIRECT is concerned
+    environ['wsgi.url_scheme'] = 'https'
+    status = []
+    body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+    b''.join(body)
+    getattr(body, 'close', lambda: None)()
+    return status[0]
+
+status = request()
+first = time.perf_counter()
+request()
+second = time.perf_counter()
+print(json.dumps({
+    'load_app': loaded - started,
+    'first_request': first - loaded,
+    'second_request': second - first,
+    'status': status,
+    'openai_loaded': 'openai' in sys.modules,
+}))
+'''
+
+PHASES = [
+    ('process', 'Process start to first response'),
+    ('load_app', '  get_wsgi_application()'),
+    ('first_request', '  First request'),
+    ('second_request', 'Second request (warm)'),
+]
+
+
+def parse_importtime(stderr):
+    """(module, self microseconds) pairs from -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, self_us, _cumulative, name = (part.strip() for part in line.replace(':', '|', 1).split('|'))
+        yield name, int(self_us)
+
+
+class Command(BaseCommand):
+    help = 'Report import times and time to first request of a fresh process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/',
+            help='Path to request (default: /)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Number of imports to list (default: 20)'
+        )
+        parser.add_argument(
+            '--by',
+            choices=['package', 'module'],
+            default='package',
+            help='Group import times by top-level package or list single modules (default: package)'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=3,
+            help='Fresh processes to start; timings are the median (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        runs = [self.run_probe(options['path']) for _ in range(max(options['runs'], 1))]
+        timings = [timing for timing, _ in runs]
+        imports = runs[-1][1]
+
+        self.stdout.write(f"GET {options['path']} -> {timings[-1]['status']}")
+        for key, label in PHASES:
+            median = statistics.median(timing[key] for timing in timings)
+            self.stdout.write(f'{label:<36} {median * 1000:8.0f} ms')
+
+        totals, counts = defaultdict(int), defaultdict(int)
+        for name, self_us in imports:
+            key = name.split('.')[0] if options['by'] == 'package' else name
+            totals[key] += self_us
+            counts[key] += 1
+        total = sum(totals.values())
+
+        self.stdout.write(f"\nImports ({len(imports)} modules, {total / 1000:.0f} ms, last run):")
+        self.stdout.write(f"{'ms':>8} {'share':>6} {'modules':>7}  {options['by']}")
+        for key, self_us in sorted(totals.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(
+                f'{self_us / 1000:8.1f} {self_us / total:6.1%} {counts[key]:>7}  {key}'
+            )
+
+        if any(timing['openai_loaded'] for timing in timings):
+            self.stdout.write(self.style.WARNING(
+                '\nThe openai SDK was imported while serving the request; '
+                'import it inside the code that calls it.'
+            ))
+
+    def run_probe(self, path):
+        """Start a fresh interpreter; returns (timings, imports)."""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        env.pop('PYTHONPROFILEIMPORTTIME', None)
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        finished = time.perf_counter()
+        if result.returncode:
+            self.stderr.write(result.stderr[-2000:])
+            raise SystemExit(result.returncode)
+
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        # Everything up to the first response, including interpreter start-up
+        timings['process'] = finished - started - timings['second_request']
+        return timings, list(parse_importtime(result.stderr))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PublicStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_complaints", models.PositiveIntegerField(default=0)),
+                ("resolved_complaints", models.PositiveIntegerField(default=0)),
+                ("counties_covered", models.PositiveIntegerField(default=0)),
+                (
+                    "recent_complaints",
+                    models.JSONField(
+                        default=list,
+                        help_text="Latest AI-processed complaints, already trimmed for display",
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Public Stats Snapshot",
+                "verbose_name_plural": "Public Stats Snapshot",
+            },
+        ),
+    ]
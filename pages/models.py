@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class PublicStats(models.Model):
+    """
+    Precomputed figures for the landing and about pages.
+
+    A single row (pk=1) rebuilt by pages.stats.refresh_public_stats, so
+    public pages never aggregate over the complaints table.
+    """
+
+    total_complaints = models.PositiveIntegerField(default=0)
+    resolved_complaints = models.PositiveIntegerField(default=0)
+    counties_covered = models.PositiveIntegerField(default=0)
+    recent_complaints = models.JSONField(
+        default=list,
+        help_text="Latest AI-processed complaints, already trimmed for display"
+    )
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Public Stats Snapshot'
+        verbose_name_plural = 'Public Stats Snapshot'
+
+    def __str__(self):
+        return f'Public stats @ {self.refreshed_at:%Y-%m-%d %H:%M}'
@@ -0,0 +1,86 @@
+"""
+Public-stats snapshot shared by the landing and about pages.
+
+The snapshot lives in one PublicStats row and in the per-process cache.
+It is rebuilt by the refresh_public_stats command (run it on a schedule),
+after process_complaints and seed_data, and by the first reader that
+finds it older than PUBLIC_STATS_MAX_AGE_SECONDS.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from complaints.models import Complaint
+
+from .models import PublicStats
+
+CACHE_KEY = 'pages:public_stats'
+RECENT_LIMIT = 5
+
+_refresh_lock = threading.Lock()
+
+
+def refresh_public_stats():
+    """Recompute the snapshot from the complaints table and store it."""
+    recent = []
+    for complaint in Complaint.objects.filter(ai_processed=True).order_by('-created_at').only(
+        'id', 'category', 'county', 'urgency', 'created_at', 'summary', 'raw_text'
+    )[:RECENT_LIMIT]:
+        recent.append({
+            'id': str(complaint.id),
+            'category': complaint.category,
+            'county': complaint.county,
+            'urgency': complaint.urgency,
+            'created_at': complaint.created_at.isoformat(),
+            'summary': complaint.short_summary,
+        })
+
+    stats, _ = PublicStats.objects.update_or_create(pk=1, defaults={
+        'total_complaints': Complaint.objects.count(),
+        'resolved_complaints': Complaint.objects.filter(is_verified=True).count(),
+        'counties_covered': Complaint.objects.values('county').distinct().count(),
+        'recent_complaints': recent,
+        'refreshed_at': timezone.now(),
+    })
+    cache.set(CACHE_KEY, stats, settings.PUBLIC_STATS_CACHE_SECONDS)
+    return stats
+
+
+def get_public_stats():
+    """Return the snapshot, rebuilding it if missing or too old."""
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = PublicStats.objects.filter(pk=1).first()
+        if stats is not None:
+            cache.set(CACHE_KEY, stats, settings.PUBLIC_STATS_CACHE_SECONDS)
+
+    max_age = timedelta(seconds=settings.PUBLIC_STATS_MAX_AGE_SECONDS)
+    if stats is not None and timezone.now() - stats.refreshed_at < max_age:
+        return stats
+
+    # One thread per worker rebuilds; the rest keep serving the old snapshot
+    if not _refresh_lock.acquire(blocking=stats is None):
+        return stats
+    try:
+        return refresh_public_stats()
+    finally:
+        _refresh_lock.release()
+
+
+def recent_complaints(stats):
+    """Unsaved Complaint instances so templates can use display helpers."""
+    return [
+        Complaint(
+            id=item['id'],
+            category=item['category'],
+            county=item['county'],
+            urgency=item['urgency'],
+            created_at=parse_datetime(item['created_at']),
+            summary=item['summary'],
+        )
+        for item in stats.recent_complaints
+    ]
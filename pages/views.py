@@ -2,37 +2,35 @@ from django.shortcuts import render
 from django.core.mail import send_mail
 from django.contrib import messages
 from django.conf import settings
-from complaints.models import Complaint
+from config.cache import anonymous_cache_page
+from config.routers import replica_reads
+from .stats import get_public_stats, recent_complaints
 
 
+@anonymous_cache_page(settings.PAGE_CACHE_SECONDS)
+@replica_reads
 def landing_page(request):
     """Landing page with hero, stats, and overview."""
-    # Get statistics for the landing page
-    total_complaints = Complaint.objects.count()
-    resolved_complaints = Complaint.objects.filter(is_verified=True).count()
-    counties_covered = Complaint.objects.values('county').distinct().count()
-
-    # Get recent complaints for preview (only verified ones)
-    recent_complaints = Complaint.objects.filter(
-        ai_processed=True
-    ).order_by('-created_at')[:5]
+    # Figures come from the precomputed snapshot, not live aggregates
+    stats = get_public_stats()
 
     context = {
-        'total_complaints': total_complaints,
-        'resolved_complaints': resolved_complaints,
-        'counties_covered': counties_covered,
-        'recent_complaints': recent_complaints,
+        'total_complaints': stats.total_complaints,
+        'resolved_complaints': stats.resolved_complaints,
+        'counties_covered': stats.counties_covered,
+        'recent_complaints': recent_complaints(stats),
     }
     return render(request, 'pages/landing.html', context)
 
 
+@anonymous_cache_page(settings.PAGE_CACHE_SECONDS)
+@replica_reads
 def about_page(request):
     """About page with mission, vision, and how it works."""
-    # Get some stats for the about page
-    total_complaints = Complaint.objects.count()
+    stats = get_public_stats()
 
     context = {
-        'total_complaints': total_complaints,
+        'total_complaints': stats.total_complaints,
     }
     return render(request, 'pages/about.html', context)
 
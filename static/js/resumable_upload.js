@@ -0,0 +1,98 @@
+// Resumable audio upload for the complaint forms (see complaints/uploads.py).
+//
+// The file is sent in chunks; after a network error the script asks the
+// server how much arrived and continues from there, so a voice note that
+// drops at 90% only re-sends the last chunk. The upload token is kept in
+// localStorage so even a page reload can resume.
+(function () {
+    const MAX_RETRIES = 8;
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    function storageKey(file) {
+        return `upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    // {offset, chunk_size, ...} for an upload, or null if the server no longer has it
+    async function uploadStatus(url) {
+        const response = await fetch(url, { cache: 'no-store' });
+        return response.ok ? response.json() : null;
+    }
+
+    async function startUpload(createUrl, csrfToken, file) {
+        const response = await fetch(createUrl, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+            body: JSON.stringify({ length: file.size, filename: file.name }),
+        });
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || 'Could not start the upload.');
+        }
+        return data;
+    }
+
+    // Upload file and resolve with the token to put in the form.
+    async function resumableUpload(file, { createUrl, csrfToken, onProgress }) {
+        const key = storageKey(file);
+        let token = localStorage.getItem(key);
+        let upload = null;
+
+        if (token) {
+            upload = await uploadStatus(createUrl + token + '/').catch(() => null);
+        }
+        if (upload === null) {
+            upload = await startUpload(createUrl, csrfToken, file);
+            token = upload.token;
+            localStorage.setItem(key, token);
+        }
+        const url = createUrl + token + '/';
+        const chunkSize = upload.chunk_size;
+        let offset = upload.offset;
+
+        let retries = 0;
+        while (offset < file.size) {
+            try {
+                const response = await fetch(url, {
+                    method: 'PATCH',
+                    headers: {
+                        'Content-Type': 'application/offset+octet-stream',
+                        'Upload-Offset': String(offset),
+                        'X-CSRFToken': csrfToken,
+                    },
+                    body: file.slice(offset, offset + chunkSize),
+                });
+                if (!response.ok && response.status !== 409) {
+                    // Rejected, not interrupted: retrying will not help
+                    localStorage.removeItem(key);
+                    const data = await response.json().catch(() => ({}));
+                    throw Object.assign(new Error(data.error || 'Upload failed.'), { fatal: true });
+                }
+                offset = parseInt(response.headers.get('Upload-Offset'), 10);
+                retries = 0;
+                if (response.status === 409) {
+                    // An earlier, stalled request may still be writing
+                    await sleep(1000);
+                }
+            } catch (error) {
+                if (error.fatal || ++retries > MAX_RETRIES) {
+                    throw error;
+                }
+                await sleep(Math.min(500 * 2 ** retries, 15000));
+                const status = await uploadStatus(url).catch(() => null);
+                if (status !== null) {
+                    offset = status.offset;
+                }
+            }
+            if (onProgress) {
+                onProgress(offset / file.size);
+            }
+        }
+        localStorage.removeItem(key);
+        return token;
+    }
+
+    window.resumableUpload = resumableUpload;
+})();